@@ -0,0 +1,151 @@
+"""
+Mediciones de rendimiento del inventario con archivo de texto.
+
+Uso (desde esta carpeta):
+    python benchmark.py                 # todas las mediciones, tamaño por defecto
+    python benchmark.py carga 500000    # una medición con N líneas
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from carga_paralela import cargar_en_paralelo
+from inventario import Inventario
+from producto import Producto
+
+LIMITE_LISTA = 20_000  # más líneas con el método de lista (O(N²)) tarda demasiado
+
+
+def generar_archivo(ruta: str, n: int, semilla: int = 42) -> None:
+    """id|nombre|cantidad|precio, con algunos IDs repetidos y líneas corruptas."""
+    rnd = random.Random(semilla)
+    with open(ruta, "w", encoding="utf-8") as f:
+        for i in range(n):
+            if i % 1000 == 999:
+                f.write("linea|corrupta\n")
+            elif i % 1000 == 998:
+                f.write(f"P{rnd.randrange(i)}|repetido|1|1.0\n")
+            else:
+                f.write(f"P{i}|producto {i}|{rnd.randint(0, 500)}|{round(rnd.uniform(1, 500), 2)}\n")
+
+
+def medir(funcion) -> float:
+    inicio = time.perf_counter()
+    funcion()
+    return time.perf_counter() - inicio
+
+
+def cargar_con_lista(ruta: str) -> list:
+    """Carga como antes del índice: lista + búsqueda lineal del ID por cada línea."""
+    productos = []
+    with open(ruta, "r", encoding="utf-8") as f:
+        for linea in f:
+            if linea.strip() == "":
+                continue
+            try:
+                producto = Producto.desde_linea(linea)
+            except ValueError:
+                continue
+            if not _id_en_lista(productos, producto.get_id()):
+                productos.append(producto)
+    return productos
+
+
+def _id_en_lista(productos: list, id_producto: str) -> bool:
+    for p in productos:
+        if p.get_id() == id_producto:
+            return True
+    return False
+
+
+def bench_carga(n: int) -> None:
+    """Carga desde inventario.txt: índice por ID (dict) vs lista con búsqueda lineal."""
+    print(f"\n[carga] {n} líneas")
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, "inventario.txt")
+        generar_archivo(ruta, n)
+
+        inventario = None
+
+        def cargar() -> None:
+            nonlocal inventario
+            inventario = Inventario(ruta)
+
+        t_dict = medir(cargar)
+        print(f"  índice por ID (dict)    {t_dict:8.3f} s  ({n / t_dict:,.0f} líneas/s)")
+
+        t_diag = medir(lambda: inventario.cargar_desde_archivo(diagnostico=True))
+        print(f"  con diagnóstico         {t_diag:8.3f} s  ({len(inventario.rechazos())} rechazos indexados)")
+
+        if n <= LIMITE_LISTA:
+            productos = []
+            t_lista = medir(lambda: productos.extend(cargar_con_lista(ruta)))
+            assert [p.get_id() for p in productos] == [p.get_id() for p in inventario.mostrar_todos()]
+            print(f"  lista (búsqueda lineal) {t_lista:8.3f} s  ({n / t_lista:,.0f} líneas/s)")
+        else:
+            print(f"  lista (búsqueda lineal) omitida (más de {LIMITE_LISTA} líneas)")
+
+
+def bench_paralela(n: int) -> None:
+    """Carga por bloques en un pool de procesos vs carga secuencial línea por línea."""
+    print(f"\n[paralela] {n} líneas ({os.cpu_count()} CPU disponibles)")
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, "inventario.txt")
+        generar_archivo(ruta, n)
+
+        secuencial = Inventario(ruta)
+        t_secuencial = medir(secuencial.cargar_desde_archivo)
+        print(f"  secuencial            {t_secuencial:8.3f} s  ({n / t_secuencial:,.0f} líneas/s)")
+
+        esperado = [p.to_linea() for p in secuencial.mostrar_todos()]
+        for procesos in (1, 4, 8):
+            resultado = []
+            t = medir(lambda: resultado.extend(cargar_en_paralelo(ruta, procesos)))
+            productos, _, _ = resultado
+            assert [p.to_linea() for p in productos.values()] == esperado
+            print(f"  pool de {procesos} proceso(s) {t:8.3f} s  ({n / t:,.0f} líneas/s)")
+
+
+def bench_incremental(n: int) -> None:
+    """Costo por cambio: reescribir todo el archivo vs anexar al archivo de cambios."""
+    cambios = 200
+    print(f"\n[incremental] {n} productos, {cambios} actualizaciones")
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, "inventario.txt")
+        for nombre, opciones in (("reescritura completa", {}), ("incremental (+/-/~)", {"incremental": True})):
+            generar_archivo(ruta, n)
+            inventario = Inventario(ruta, **opciones)
+            ids = [p.get_id() for p in inventario.mostrar_todos()]
+            rnd = random.Random(7)
+            t = medir(lambda: [inventario.actualizar_por_id(rnd.choice(ids), rnd.randint(0, 500)) for _ in range(cambios)])
+            t_carga = medir(lambda: Inventario(ruta))
+            print(f"  {nombre:22} {t / cambios * 1000:9.3f} ms/cambio  (carga posterior {t_carga:.3f} s)")
+            for sufijo in (".cambios", ".cambios.1"):
+                if os.path.exists(ruta + sufijo):
+                    os.remove(ruta + sufijo)
+
+
+MEDICIONES = {
+    "carga": bench_carga,
+    "paralela": bench_paralela,
+    "incremental": bench_incremental,
+}
+
+
+def main() -> None:
+    nombre = sys.argv[1] if len(sys.argv) > 1 else None
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 500_000
+
+    if nombre is None:
+        for funcion in MEDICIONES.values():
+            funcion(n)
+    elif nombre in MEDICIONES:
+        MEDICIONES[nombre](n)
+    else:
+        print(f"Medición desconocida. Opciones: {', '.join(MEDICIONES)}")
+
+
+if __name__ == "__main__":
+    main()
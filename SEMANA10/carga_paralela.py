@@ -0,0 +1,134 @@
+"""
+Carga en paralelo de inventario.txt (formato id|nombre|cantidad|precio).
+
+- El archivo se divide en bloques grandes, siempre cortados justo después de un salto de línea.
+- Cada proceso del pool lee su bloque, lo decodifica de una vez y valida las
+  líneas con Producto.campos_desde_linea (mismas reglas que la carga normal).
+- El proceso principal une los bloques en orden: gana la primera aparición
+  de cada ID y se suman las líneas corruptas de todos los bloques.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from producto import Producto
+from rechazos import Rechazo
+
+TAM_BLOQUE_MIN = 1 << 20   # 1 MB
+TAM_BLOQUE_MAX = 16 << 20  # 16 MB: acota la memoria de cada proceso
+
+
+def dividir_en_bloques(ruta: str, procesos: int):
+    """
+    Retorna una lista de (inicio, fin) en bytes que cubre todo el archivo.
+    Se apunta a ~4 bloques por proceso para repartir bien la carga.
+    """
+    tam_archivo = os.path.getsize(ruta)
+    tam_bloque = min(TAM_BLOQUE_MAX, max(TAM_BLOQUE_MIN, tam_archivo // (procesos * 4)))
+
+    bloques = []
+    inicio = 0
+    with open(ruta, "rb") as f:
+        while inicio < tam_archivo:
+            f.seek(inicio + tam_bloque)
+            f.readline()  # avanzar hasta el próximo fin de línea
+            fin = min(f.tell(), tam_archivo)
+            bloques.append((inicio, fin))
+            inicio = fin
+    return bloques
+
+
+def parsear_bloque(ruta: str, bloque, diagnostico: bool = False):
+    """
+    Se ejecuta en un proceso del pool.
+    Retorna (filas, líneas corruptas, offsets, rechazos):
+    - filas: tuplas (id, nombre, cantidad, precio)
+    - offsets: (offset, largo en bytes) de cada fila (None si no hay diagnóstico)
+    - rechazos: (offset, largo, motivo, línea) de cada línea corrupta (vacía sin diagnóstico)
+    """
+    inicio, fin = bloque
+    with open(ruta, "rb") as f:
+        f.seek(inicio)
+        datos = f.read(fin - inicio)
+
+    if diagnostico:
+        return _parsear_con_offsets(datos, inicio)
+
+    # Mismos saltos de línea que la lectura en modo texto (\n, \r\n y \r)
+    texto = datos.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+
+    filas = []
+    lineas_corruptas = 0
+    for linea in texto.split("\n"):
+        if linea.strip() == "":
+            continue
+        try:
+            filas.append(Producto.campos_desde_linea(linea))
+        except ValueError:
+            lineas_corruptas += 1
+    return filas, lineas_corruptas, None, []
+
+
+def _parsear_con_offsets(datos: bytes, inicio: int):
+    """Igual que parsear_bloque, pero línea por línea en bytes para conocer cada offset."""
+    filas = []
+    offsets = []
+    rechazos = []
+    offset = inicio
+    for crudo in datos.split(b"\n"):
+        posicion = offset
+        offset += len(crudo) + 1
+        largo = len(crudo.rstrip(b"\r"))
+        try:
+            linea = crudo.decode("utf-8")
+            if linea.strip() == "":
+                continue
+            filas.append(Producto.campos_desde_linea(linea))
+            offsets.append((posicion, largo))
+        except UnicodeDecodeError as e:
+            motivo = f"La línea no es UTF-8 válido (byte {posicion + e.start})."
+            rechazos.append((posicion, largo, motivo, crudo.rstrip(b"\r").decode("utf-8", errors="replace")))
+        except ValueError as e:
+            rechazos.append((posicion, largo, str(e), linea.rstrip("\r")))
+    return filas, len(rechazos), offsets, rechazos
+
+
+def _leer_linea(archivo, offset: int, largo: int) -> str:
+    """
+    Texto crudo de una línea del archivo (como lo guarda la carga secuencial).
+    Los procesos no devuelven las líneas válidas: solo se relee la de cada
+    duplicado, que son pocas.
+    """
+    archivo.seek(offset)
+    return archivo.read(largo).decode("utf-8")
+
+
+def cargar_en_paralelo(ruta: str, procesos: int, diagnostico: bool = False):
+    """
+    Retorna (dict ID -> Producto en orden de aparición, líneas corruptas, rechazos).
+    Con diagnostico=True, rechazos es la lista de Rechazo (corruptas y
+    duplicadas, por offset); si no, queda vacía.
+    Puede lanzar OSError igual que la lectura normal del archivo.
+    """
+    productos = {}
+    lineas_corruptas = 0
+    rechazos = []
+    bloques = dividir_en_bloques(ruta, procesos)
+
+    with ProcessPoolExecutor(max_workers=procesos) as pool, open(ruta, "rb") as archivo:
+        # map entrega los resultados en el orden de los bloques
+        resultados = pool.map(parsear_bloque, repeat(ruta), bloques, repeat(diagnostico))
+        for filas, corruptas, offsets, corruptas_bloque in resultados:
+            lineas_corruptas += corruptas
+            for offset, largo, motivo, linea in corruptas_bloque:
+                rechazos.append(Rechazo(offset, Rechazo.CORRUPTA, motivo, linea, largo))
+            for i, fila in enumerate(filas):
+                if fila[0] not in productos:
+                    productos[fila[0]] = Producto(*fila)
+                elif diagnostico:
+                    offset, largo = offsets[i]
+                    motivo = f"ID '{fila[0]}' repetido (se conserva la primera aparición)."
+                    rechazos.append(Rechazo(offset, Rechazo.DUPLICADA, motivo, _leer_linea(archivo, offset, largo), largo))
+
+    rechazos.sort(key=lambda r: r.offset)
+    return productos, lineas_corruptas, rechazos
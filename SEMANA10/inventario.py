@@ -1,93 +1,465 @@
 from producto import Producto
+from carga_paralela import cargar_en_paralelo
+from rechazos import Rechazo
 import os
+import shutil
+import threading
+import time
+import weakref
+
+# Modo incremental: los cambios se anexan a inventario.txt.cambios
+SUFIJO_CAMBIOS = ".cambios"
+SUFIJO_ROTADO = ".1"        # cambios que está absorbiendo una compactación en curso
+UMBRAL_COMPACTACION = 1000  # registros mínimos antes de compactar (o tantos como productos)
+
+
+def _escribir_lineas(ruta: str, lineas):
+    """
+    Escribe las líneas en un temporal y reemplaza `ruta` de forma atómica.
+    Retorna (ok: bool, mensaje: str)
+    """
+    temp = ruta + ".tmp"
+
+    try:
+        with open(temp, "w", encoding="utf-8") as f:
+            for linea in lineas:
+                f.write(linea + "\n")
+
+        # Reemplazo atómico (más seguro)
+        os.replace(temp, ruta)
+        return True, "Archivo actualizado correctamente."
+
+    except PermissionError:
+        return False, "PermissionError: No tienes permisos para escribir en el archivo."
+    except OSError as e:
+        return False, f"OSError: Error del sistema al escribir el archivo. {e}"
+    finally:
+        # Limpieza: si quedó temp por error, intentamos borrarlo
+        try:
+            if os.path.exists(temp):
+                os.remove(temp)
+        except Exception:
+            pass
+
+
+def _guardar_pendientes(ruta: str, productos: dict, lock):
+    """
+    Guardado final de un inventario con cambios diferidos sin guardar, cuando
+    se libera o al salir del programa (lo llama weakref.finalize). Recibe los
+    datos y no el inventario, que para entonces puede no existir.
+    """
+    with lock:
+        ok, _ = _escribir_lineas(ruta, (p.to_linea() for p in productos.values()))
+        if ok:
+            # Igual que guardar_en_archivo: la base ya incluye los cambios anexados
+            for sufijo in (SUFIJO_CAMBIOS, SUFIJO_CAMBIOS + SUFIJO_ROTADO):
+                try:
+                    os.remove(ruta + sufijo)
+                except OSError:
+                    pass
 
 
 class Inventario:
     """
-    Maneja una lista de productos y su persistencia en archivo.
+    Maneja una colección de productos y su persistencia en archivo.
+    Los productos se guardan en un dict ID -> Producto: buscar por ID es O(1)
+    y el dict conserva el orden de inserción (mostrar_todos y el archivo).
     Requisitos:
     - Añadir, eliminar, actualizar y buscar
     - Guardar automáticamente cambios en inventario.txt
     - Cargar inventario desde archivo al iniciar
     - Manejo robusto de excepciones de archivos
+
+    Guardado diferido (write-behind):
+    - Por defecto cada cambio reescribe el archivo al instante.
+    - Si se indica intervalo_guardado (segundos) y/o max_cambios, los cambios
+      solo marcan el inventario como "sucio" y se guarda cuando se juntan
+      max_cambios cambios o pasan intervalo_guardado segundos desde el último
+      guardado (un temporizador guarda lo que quede al final de una ráfaga).
+    - flush() guarda ya lo pendiente. Mientras haya cambios sin guardar, un
+      weakref.finalize los guarda si el inventario se libera o al salir del
+      programa; solo retiene el dict de productos, no el inventario.
+    - cerrar() (o usarlo con "with") guarda lo pendiente y detiene el temporizador.
+    - El guardado sigue siendo atómico (archivo temporal + os.replace).
+
+    Modo incremental (incremental=True):
+    - Cada cambio anexa una línea a inventario.txt.cambios: "+|<to_linea>",
+      "~|<to_linea>" o "-|<id>". Costo O(1) de disco por cambio.
+    - Al cargar se leen las líneas base y luego se re-aplican los cambios.
+      Un inventario.txt sin archivo de cambios se carga igual que siempre.
+    - Cuando se acumulan suficientes registros, el archivo de cambios se rota
+      (.cambios -> .cambios.1) y un hilo en segundo plano reescribe la base de
+      forma atómica; al terminar borra .cambios.1.
+
+    Diagnóstico de carga (diagnostico=True al cargar):
+    - En la misma pasada se guarda, por offset en bytes, cada línea corrupta o
+      duplicada de la base (ver rechazos()), sin volver a leer el archivo.
+    - reparar_linea(offset, texto) corrige una línea rechazada en el mismo
+      lugar del archivo. Al reescribir la base completa el índice se vacía,
+      porque esas líneas ya no están en el archivo.
     """
 
-    def __init__(self, ruta_archivo: str = "inventario.txt"):
-        self.__productos = []
+    def __init__(
+        self,
+        ruta_archivo: str = "inventario.txt",
+        intervalo_guardado: float = None,
+        max_cambios: int = None,
+        procesos_carga: int = 1,
+        incremental: bool = False,
+        diagnostico_carga: bool = False,
+    ):
+        self.__productos = {}  # ID -> Producto
         self.__ruta = ruta_archivo
 
+        self.__incremental = incremental
+        self.__ruta_cambios = ruta_archivo + SUFIJO_CAMBIOS
+        self.__archivo_cambios = None
+        self.__registros = 0  # registros en el archivo de cambios desde la última compactación
+        # Una sola escritura de la base a la vez (también entre hilos)
+        self.__lock_compactacion = threading.Lock()
+        self.__rechazos = {}  # offset -> Rechazo (líneas descartadas de la base)
+
+        self.__intervalo = intervalo_guardado
+        self.__max_cambios = max_cambios
+        self.__pendientes = 0
+        self.__ultimo_guardado = time.monotonic()
+        self.__temporizador = None
+        # El temporizador guarda desde otro hilo: cambios y guardado se excluyen
+        self.__lock = threading.RLock()
+        self.__guardado_final = None  # weakref.finalize activo mientras haya pendientes
+
         # Al iniciar: cargar datos desde archivo (o crearlo si no existe)
-        self.cargar_desde_archivo()
+        self.cargar_desde_archivo(procesos_carga, diagnostico_carga)
 
     # -------------------------
     # Lógica de negocio (POO)
     # -------------------------
     def id_existe(self, id_producto: str) -> bool:
-        for p in self.__productos:
-            if p.get_id() == id_producto:
-                return True
-        return False
+        return id_producto in self.__productos
 
     def anadir_producto(self, producto: Producto):
         """
         Retorna (ok: bool, mensaje: str)
         """
-        if self.id_existe(producto.get_id()):
-            return False, "Error: Ese ID ya existe. No se agregó."
+        with self.__lock:
+            if self.id_existe(producto.get_id()):
+                return False, "Error: Ese ID ya existe. No se agregó."
 
-        self.__productos.append(producto)
+            self.__productos[producto.get_id()] = producto
 
-        ok_archivo, msg_archivo = self.guardar_en_archivo()
-        if ok_archivo:
-            return True, "Producto agregado y guardado en archivo correctamente."
-        else:
-            return False, f"Producto agregado en memoria, pero falló el guardado en archivo. Detalle: {msg_archivo}"
+            return self.__registrar_cambio(
+                f"+|{producto.to_linea()}",
+                "Producto agregado y guardado en archivo correctamente.",
+                "Producto agregado (se guardará en archivo en breve).",
+                "Producto agregado en memoria, pero falló el guardado en archivo.",
+            )
 
     def eliminar_por_id(self, id_producto: str):
         """
         Retorna (ok: bool, mensaje: str)
         """
-        for i, p in enumerate(self.__productos):
-            if p.get_id() == id_producto:
-                self.__productos.pop(i)
+        with self.__lock:
+            if self.__productos.pop(id_producto, None) is None:
+                return False, "No se encontró un producto con ese ID."
 
-                ok_archivo, msg_archivo = self.guardar_en_archivo()
-                if ok_archivo:
-                    return True, "Producto eliminado y archivo actualizado."
-                else:
-                    return False, f"Producto eliminado en memoria, pero falló la actualización del archivo. Detalle: {msg_archivo}"
-
-        return False, "No se encontró un producto con ese ID."
+            return self.__registrar_cambio(
+                f"-|{id_producto}",
+                "Producto eliminado y archivo actualizado.",
+                "Producto eliminado (se guardará en archivo en breve).",
+                "Producto eliminado en memoria, pero falló la actualización del archivo.",
+            )
 
     def actualizar_por_id(self, id_producto: str, nueva_cantidad=None, nuevo_precio=None):
         """
         Retorna (ok: bool, mensaje: str)
         """
-        for p in self.__productos:
-            if p.get_id() == id_producto:
-                if nueva_cantidad is not None:
-                    p.set_cantidad(nueva_cantidad)
-                if nuevo_precio is not None:
-                    p.set_precio(nuevo_precio)
+        with self.__lock:
+            p = self.__productos.get(id_producto)
+            if p is None:
+                return False, "No se encontró el ID para actualizar."
 
-                ok_archivo, msg_archivo = self.guardar_en_archivo()
-                if ok_archivo:
-                    return True, "Producto actualizado y guardado en archivo."
-                else:
-                    return False, f"Producto actualizado en memoria, pero falló el guardado en archivo. Detalle: {msg_archivo}"
+            if nueva_cantidad is not None:
+                p.set_cantidad(nueva_cantidad)
+            if nuevo_precio is not None:
+                p.set_precio(nuevo_precio)
 
-        return False, "No se encontró el ID para actualizar."
+            return self.__registrar_cambio(
+                f"~|{p.to_linea()}",
+                "Producto actualizado y guardado en archivo.",
+                "Producto actualizado (se guardará en archivo en breve).",
+                "Producto actualizado en memoria, pero falló el guardado en archivo.",
+            )
 
     def buscar_por_nombre(self, texto: str):
         texto = texto.strip().lower()
         resultados = []
-        for p in self.__productos:
+        for p in self.__productos.values():
             if texto in p.get_nombre().lower():
                 resultados.append(p)
         return resultados
 
     def mostrar_todos(self):
-        return self.__productos
+        return list(self.__productos.values())
+
+    # -------------------------
+    # Guardado diferido
+    # -------------------------
+    def __registrar_cambio(self, registro: str, msg_guardado: str, msg_diferido: str, msg_error: str):
+        """
+        Modo incremental: anexa el registro al archivo de cambios.
+        Si no, marca un cambio y guarda solo si se llegó a max_cambios o ya pasó el intervalo.
+        Retorna (ok: bool, mensaje: str)
+        """
+        if self.__incremental:
+            ok_archivo, msg_archivo = self.__anexar_registro(registro)
+            if ok_archivo:
+                return True, msg_guardado
+            return False, f"{msg_error} Detalle: {msg_archivo}"
+
+        self.__pendientes += 1
+        transcurrido = time.monotonic() - self.__ultimo_guardado
+
+        diferido = self.__intervalo is not None or self.__max_cambios is not None
+        por_cantidad = self.__max_cambios is not None and self.__pendientes >= self.__max_cambios
+        por_tiempo = self.__intervalo is not None and transcurrido >= self.__intervalo
+
+        if diferido and not (por_cantidad or por_tiempo):
+            self.__armar_guardado_final()
+            if self.__intervalo is not None:
+                self.__programar_flush(self.__intervalo - transcurrido)
+            return True, msg_diferido
+
+        ok_archivo, msg_archivo = self.guardar_en_archivo()
+        if ok_archivo:
+            return True, msg_guardado
+        return False, f"{msg_error} Detalle: {msg_archivo}"
+
+    def __programar_flush(self, segundos: float):
+        if self.__temporizador is None or not self.__temporizador.is_alive():
+            self.__temporizador = threading.Timer(segundos, self.flush)
+            self.__temporizador.daemon = True
+            self.__temporizador.start()
+
+    def __armar_guardado_final(self):
+        """
+        El finalizador recibe el dict de productos (no el inventario), así que no
+        impide liberarlo. weakref.finalize también lo corre al salir del programa.
+        """
+        if self.__guardado_final is None:
+            self.__guardado_final = weakref.finalize(
+                self, _guardar_pendientes, self.__ruta, self.__productos, self.__lock
+            )
+
+    def __desarmar_guardado_final(self):
+        if self.__guardado_final is not None:
+            self.__guardado_final.detach()
+            self.__guardado_final = None
+
+    def cerrar(self):
+        """
+        Guarda lo pendiente, detiene el temporizador y cierra el archivo de cambios.
+        Si el guardado falla, lo pendiente se reintenta al salir del programa.
+        Retorna (ok: bool, mensaje: str) del guardado.
+        """
+        with self.__lock:
+            if self.__temporizador is not None:
+                self.__temporizador.cancel()
+                self.__temporizador = None
+            resultado = self.flush()
+            self.__cerrar_cambios()
+            return resultado
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def hay_cambios_pendientes(self) -> bool:
+        return self.__pendientes > 0
+
+    def flush(self):
+        """
+        Guarda ahora los cambios pendientes (si los hay).
+        Retorna (ok: bool, mensaje: str)
+        """
+        with self.__lock:
+            if self.__pendientes == 0:
+                return True, "No hay cambios pendientes."
+            return self.guardar_en_archivo()
+
+    # -------------------------
+    # Diagnóstico de carga
+    # -------------------------
+    def rechazos(self, tipo: str = None):
+        """
+        Líneas descartadas en la última carga con diagnóstico, ordenadas por offset.
+        tipo: Rechazo.CORRUPTA, Rechazo.DUPLICADA o None (todas).
+        """
+        return sorted(
+            (r for r in self.__rechazos.values() if tipo is None or r.tipo == tipo),
+            key=lambda r: r.offset,
+        )
+
+    def rechazo_en(self, offset: int):
+        return self.__rechazos.get(offset)
+
+    def reparar_linea(self, offset: int, nueva_linea: str):
+        """
+        Corrige la línea rechazada que empieza en `offset`.
+        - Si el texto nuevo entra en el lugar de la línea original, se escribe
+          ahí mismo (se completa con espacios) y el resto de los offsets no cambia.
+        - Si es más largo, el producto se agrega como un alta normal.
+        Retorna (ok: bool, mensaje: str)
+        """
+        with self.__lock:
+            rechazo = self.__rechazos.get(offset)
+            if rechazo is None:
+                return False, "No hay una línea rechazada en ese offset."
+
+            try:
+                producto = Producto.desde_linea(nueva_linea)
+            except ValueError as e:
+                return False, f"La línea sigue siendo inválida: {e}"
+            if self.id_existe(producto.get_id()):
+                return False, "Error: Ese ID ya existe. No se reparó."
+
+            nuevo = nueva_linea.strip().encode("utf-8")
+            if len(nuevo) > rechazo.largo:
+                ok, msg = self.anadir_producto(producto)
+                if ok:
+                    # Si el alta reescribió la base, el índice ya quedó vacío
+                    self.__rechazos.pop(offset, None)
+                    return True, f"La línea no entra en su lugar original; el producto se agregó como alta. {msg}"
+                return ok, msg
+
+            # Una compactación en curso no debe reemplazar la base mientras escribimos
+            with self.__lock_compactacion:
+                if offset not in self.__rechazos:
+                    return False, "La base se reescribió; esa línea ya no está en el archivo."
+                try:
+                    with open(self.__ruta, "r+b") as f:
+                        f.seek(offset)
+                        f.write(nuevo.ljust(rechazo.largo, b" "))
+                except PermissionError:
+                    return False, "PermissionError: No tienes permisos para escribir en el archivo."
+                except OSError as e:
+                    return False, f"OSError: Error del sistema al escribir el archivo. {e}"
+                del self.__rechazos[offset]
+
+            self.__productos[producto.get_id()] = producto
+            return True, "Línea reparada en el archivo."
+
+    # -------------------------
+    # Modo incremental
+    # -------------------------
+    def __anexar_registro(self, registro: str):
+        """Retorna (ok: bool, mensaje: str)"""
+        try:
+            if self.__archivo_cambios is None:
+                self.__archivo_cambios = self.__abrir_cambios()
+            self.__archivo_cambios.write(registro + "\n")
+            self.__archivo_cambios.flush()
+        except PermissionError:
+            return False, "PermissionError: No tienes permisos para escribir el archivo de cambios."
+        except OSError as e:
+            return False, f"OSError: Error del sistema al escribir el archivo de cambios. {e}"
+
+        self.__registros += 1
+        if self.__registros >= max(UMBRAL_COMPACTACION, len(self.__productos)):
+            self.__compactar_en_segundo_plano()
+        return True, "Cambio registrado."
+
+    def __abrir_cambios(self):
+        archivo = open(self.__ruta_cambios, "a", encoding="utf-8")
+        if archivo.tell() > 0:
+            with open(self.__ruta_cambios, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    # Última línea cortada (se ignora al cargar): el registro nuevo va en otra línea
+                    archivo.write("\n")
+        return archivo
+
+    def __cerrar_cambios(self):
+        if self.__archivo_cambios is not None:
+            self.__archivo_cambios.close()
+            self.__archivo_cambios = None
+
+    def __compactar_en_segundo_plano(self):
+        """
+        Rota el archivo de cambios y reescribe la base en otro hilo.
+        Los cambios nuevos van a un archivo de cambios vacío mientras tanto.
+        """
+        if not self.__lock_compactacion.acquire(blocking=False):
+            return  # ya hay una compactación en curso
+
+        rotado = self.__ruta_cambios + SUFIJO_ROTADO
+        try:
+            self.__cerrar_cambios()
+            if os.path.exists(rotado):
+                # Quedó de una compactación que no terminó: se conservan sus registros
+                with open(self.__ruta_cambios, "r", encoding="utf-8") as origen, \
+                        open(rotado, "a", encoding="utf-8") as destino:
+                    shutil.copyfileobj(origen, destino)
+                os.remove(self.__ruta_cambios)
+            else:
+                os.replace(self.__ruta_cambios, rotado)
+        except OSError:
+            # Se reintenta con el próximo cambio; no se pierde nada
+            self.__lock_compactacion.release()
+            return
+
+        self.__registros = 0
+        lineas = [p.to_linea() for p in self.__productos.values()]
+        hilo = threading.Thread(target=self.__terminar_compactacion, args=(lineas, rotado), daemon=True)
+        hilo.start()
+
+    def __terminar_compactacion(self, lineas, rotado: str):
+        try:
+            ok, _ = self.__escribir_base(lineas)
+            if ok:
+                self.__rechazos = {}
+                os.remove(rotado)
+        except OSError:
+            pass  # .cambios.1 queda y se re-aplica al cargar
+        finally:
+            self.__lock_compactacion.release()
+
+    def __reaplicar_cambios(self):
+        """
+        Re-aplica .cambios.1 y .cambios (en ese orden) sobre lo cargado.
+        Los registros "+" y "~" traen el producto completo, así que aplicarlos
+        dos veces da el mismo resultado.
+        Retorna la cantidad de registros corruptos.
+        """
+        corruptos = 0
+        for ruta in (self.__ruta_cambios + SUFIJO_ROTADO, self.__ruta_cambios):
+            if not os.path.exists(ruta):
+                continue
+            with open(ruta, "r", encoding="utf-8") as f:
+                lineas = f.readlines()
+
+            for i, linea in enumerate(lineas):
+                if linea.strip() == "":
+                    continue
+                try:
+                    self.__aplicar_registro(linea)
+                    self.__registros += 1
+                except ValueError:
+                    # La última línea puede quedar a medias si se cortó la escritura
+                    if i < len(lineas) - 1 or linea.endswith("\n"):
+                        corruptos += 1
+        return corruptos
+
+    def __aplicar_registro(self, linea: str):
+        op, _, datos = linea.rstrip("\n").partition("|")
+        if op in ("+", "~"):
+            producto = Producto.desde_linea(datos)
+            self.__productos[producto.get_id()] = producto
+        elif op == "-" and datos.strip():
+            self.__productos.pop(datos.strip(), None)
+        else:
+            raise ValueError("Registro de cambios inválido.")
 
     # -------------------------
     # Persistencia en archivos
@@ -109,34 +481,59 @@ class Inventario:
         except OSError as e:
             return False, f"OSError: Error del sistema al asegurar el archivo. {e}"
 
-    def cargar_desde_archivo(self):
+    def cargar_desde_archivo(self, procesos: int = 1, diagnostico: bool = False):
         """
         Carga productos desde el archivo.
         - Si no existe, lo crea.
         - Si hay líneas corruptas, las ignora y continúa.
+        - Con procesos > 1 el archivo se procesa por bloques en paralelo
+          (conviene para archivos muy grandes; ver carga_paralela.py).
+        - Con diagnostico=True se registran offset y motivo de cada línea
+          corrupta o duplicada (ver rechazos()). En este modo solo \n separa líneas.
         Retorna (ok: bool, mensaje: str)
         """
+        # Una compactación en curso podría reemplazar la base y borrar .cambios.1
+        # entre que se lee la base vieja y se buscan los cambios: se espera a que
+        # termine y se bloquea la siguiente durante toda la carga.
+        with self.__lock, self.__lock_compactacion:
+            return self.__cargar(procesos, diagnostico)
+
+    def __cargar(self, procesos: int, diagnostico: bool):
         ok, msg = self.asegurar_archivo()
         if not ok:
             # No se puede ni crear el archivo: inventario queda vacío
             return False, msg
 
         try:
-            self.__productos = []  # Reiniciamos en memoria
+            # El guardado final apunta al dict viejo (y lo pendiente se descarta)
+            self.__desarmar_guardado_final()
+            self.__productos = {}  # Reiniciamos en memoria
+            self.__pendientes = 0
+            self.__registros = 0
+            self.__rechazos = {}
             lineas_corruptas = 0
 
-            with open(self.__ruta, "r", encoding="utf-8") as f:
-                for linea in f:
-                    if linea.strip() == "":
-                        continue
-                    try:
-                        producto = Producto.desde_linea(linea)
-                        # Evitar duplicados por seguridad
-                        if not self.id_existe(producto.get_id()):
-                            self.__productos.append(producto)
-                    except ValueError:
-                        lineas_corruptas += 1
-                        # Se ignora la línea corrupta y se sigue
+            if procesos > 1:
+                self.__productos, lineas_corruptas, rechazos = cargar_en_paralelo(self.__ruta, procesos, diagnostico)
+                self.__rechazos = {r.offset: r for r in rechazos}
+            elif diagnostico:
+                lineas_corruptas = self.__cargar_con_diagnostico()
+            else:
+                with open(self.__ruta, "r", encoding="utf-8") as f:
+                    for linea in f:
+                        if linea.strip() == "":
+                            continue
+                        try:
+                            producto = Producto.desde_linea(linea)
+                            # Evitar duplicados por seguridad
+                            if not self.id_existe(producto.get_id()):
+                                self.__productos[producto.get_id()] = producto
+                        except ValueError:
+                            lineas_corruptas += 1
+                            # Se ignora la línea corrupta y se sigue
+
+            # Cambios anexados en modo incremental (si los hay)
+            lineas_corruptas += self.__reaplicar_cambios()
 
             if lineas_corruptas > 0:
                 return True, f"Inventario cargado con advertencia: {lineas_corruptas} línea(s) corrupta(s) fueron ignoradas."
@@ -150,6 +547,39 @@ class Inventario:
         except OSError as e:
             return False, f"OSError: Error del sistema al leer el archivo. {e}"
 
+    def __cargar_con_diagnostico(self):
+        """Carga secuencial en binario para conocer el offset de cada línea. Retorna las corruptas."""
+        lineas_corruptas = 0
+        offset = 0
+        with open(self.__ruta, "rb") as f:
+            for crudo in f:
+                posicion = offset
+                offset += len(crudo)
+                # Texto para el informe (los bytes inválidos se muestran como \ufffd)
+                texto = crudo.rstrip(b"\r\n").decode("utf-8", errors="replace")
+                largo = len(crudo.rstrip(b"\r\n"))
+                try:
+                    linea = crudo.decode("utf-8")
+                    if linea.strip() == "":
+                        continue
+                    producto = Producto.desde_linea(linea)
+                except UnicodeDecodeError as e:
+                    lineas_corruptas += 1
+                    motivo = f"La línea no es UTF-8 válido (byte {posicion + e.start})."
+                    self.__rechazos[posicion] = Rechazo(posicion, Rechazo.CORRUPTA, motivo, texto, largo)
+                    continue
+                except ValueError as e:
+                    lineas_corruptas += 1
+                    self.__rechazos[posicion] = Rechazo(posicion, Rechazo.CORRUPTA, str(e), texto, largo)
+                    continue
+
+                if self.id_existe(producto.get_id()):
+                    motivo = f"ID '{producto.get_id()}' repetido (se conserva la primera aparición)."
+                    self.__rechazos[posicion] = Rechazo(posicion, Rechazo.DUPLICADA, motivo, texto, largo)
+                else:
+                    self.__productos[producto.get_id()] = producto
+        return lineas_corruptas
+
     def guardar_en_archivo(self):
         """
         Guarda TODO el inventario en el archivo.
@@ -158,29 +588,44 @@ class Inventario:
         - Luego reemplaza el archivo real
         Retorna (ok: bool, mensaje: str)
         """
+        with self.__lock:
+            return self.__guardar()
+
+    def __guardar(self):
         ok, msg = self.asegurar_archivo()
         if not ok:
             return False, msg
 
-        temp = self.__ruta + ".tmp"
+        # Si hay una compactación en segundo plano, se espera a que termine
+        # (si no, podría reemplazar la base con un estado más viejo)
+        with self.__lock_compactacion:
+            ok, msg = self.__escribir_base(p.to_linea() for p in self.__productos.values())
+            if not ok:
+                return False, msg
+            self.__rechazos = {}
 
-        try:
-            with open(temp, "w", encoding="utf-8") as f:
-                for p in self.__productos:
-                    f.write(p.to_linea() + "\n")
+            # La base ya incluye todos los cambios anexados
+            try:
+                self.__cerrar_cambios()
+                for ruta in (self.__ruta_cambios, self.__ruta_cambios + SUFIJO_ROTADO):
+                    if os.path.exists(ruta):
+                        os.remove(ruta)
+            except OSError as e:
+                return False, f"OSError: No se pudo limpiar el archivo de cambios. {e}"
+            self.__registros = 0
 
-            # Reemplazo atómico (más seguro)
-            os.replace(temp, self.__ruta)
-            return True, "Archivo actualizado correctamente."
+        # Todo lo pendiente quedó en disco
+        self.__pendientes = 0
+        self.__desarmar_guardado_final()
+        self.__ultimo_guardado = time.monotonic()
+        if self.__temporizador is not None:
+            self.__temporizador.cancel()
+            self.__temporizador = None
+        return True, "Archivo actualizado correctamente."
 
-        except PermissionError:
-            return False, "PermissionError: No tienes permisos para escribir en el archivo."
-        except OSError as e:
-            return False, f"OSError: Error del sistema al escribir el archivo. {e}"
-        finally:
-            # Limpieza: si quedó temp por error, intentamos borrarlo
-            try:
-                if os.path.exists(temp):
-                    os.remove(temp)
-            except Exception:
-                pass
\ No newline at end of file
+    def __escribir_base(self, lineas):
+        """
+        Escribe las líneas en un temporal y reemplaza el archivo base.
+        Retorna (ok: bool, mensaje: str)
+        """
+        return _escribir_lineas(self.__ruta, lineas)
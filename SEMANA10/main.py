@@ -27,7 +27,8 @@ def leer_flotante(mensaje: str) -> float:
 
 
 def menu():
-    inventario = Inventario("inventario.txt")
+    # Guardado diferido: como máximo cada 2 s o cada 50 cambios (y siempre al salir)
+    inventario = Inventario("inventario.txt", intervalo_guardado=2.0, max_cambios=50)
 
     ok, msg = inventario.cargar_desde_archivo()
     if ok:
@@ -123,6 +124,10 @@ def menu():
                     print(" -", p)
 
         elif opcion == "0":
+            ok, msg = inventario.cerrar()
+            if not ok:
+                print("❌", msg)
+                continue
             print("\n👋 Saliendo del sistema. Inventario guardado. ¡Buen trabajo!")
             break
 
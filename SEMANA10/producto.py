@@ -51,6 +51,15 @@ class Producto:
         Reconstruye un Producto desde una línea del archivo.
         Lanza ValueError si la línea está corrupta.
         """
+        return Producto(*Producto.campos_desde_linea(linea))
+
+    @staticmethod
+    def campos_desde_linea(linea: str):
+        """
+        Valida una línea del archivo y retorna (id, nombre, cantidad, precio)
+        sin crear el objeto (la carga en paralelo envía tuplas entre procesos).
+        Lanza ValueError si la línea está corrupta.
+        """
         partes = linea.strip().split("|")
         if len(partes) != 4:
             raise ValueError("Formato inválido (se esperaban 4 campos).")
@@ -66,7 +75,7 @@ class Producto:
         if cantidad < 0 or precio < 0:
             raise ValueError("Cantidad o precio negativo.")
 
-        return Producto(id_producto, nombre, cantidad, precio)
+        return id_producto, nombre, cantidad, precio
 
     def __str__(self) -> str:
         return f"ID: {self.__id} | Nombre: {self.__nombre} | Cantidad: {self.__cantidad} | Precio: ${self.__precio:.2f}"
\ No newline at end of file
@@ -0,0 +1,22 @@
+class Rechazo:
+    """
+    Línea del archivo base que se descartó al cargar.
+    - offset: posición en bytes donde empieza la línea (sirve para repararla)
+    - tipo: CORRUPTA (no pasó la validación) o DUPLICADA (ID ya cargado antes)
+    - motivo: descripción del problema
+    - linea: texto de la línea, sin el salto de línea
+    - largo: bytes que ocupa la línea en el archivo, sin el salto de línea
+    """
+
+    CORRUPTA = "corrupta"
+    DUPLICADA = "duplicada"
+
+    def __init__(self, offset: int, tipo: str, motivo: str, linea: str, largo: int):
+        self.offset = offset
+        self.tipo = tipo
+        self.motivo = motivo
+        self.linea = linea
+        self.largo = largo
+
+    def __str__(self) -> str:
+        return f"[byte {self.offset}] {self.tipo}: {self.motivo} -> {self.linea!r}"
@@ -0,0 +1,591 @@
+"""
+Mediciones de rendimiento del inventario avanzado.
+
+Uso (desde esta carpeta):
+    python benchmark.py                 # todas las mediciones, tamaño por defecto
+    python benchmark.py busqueda 500000 # una medición con N productos
+"""
+from __future__ import annotations
+
+import asyncio
+import copy
+import json
+import math
+import os
+import pickle
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from producto import Producto
+from inventario import Inventario
+from inventario_async import AsyncInventario
+from inventario_concurrente import InventarioConcurrente
+from storage import Journal, cargar_inventario, exportar_csv, guardar_inventario, importar_csv
+
+PALABRAS = [
+    "balón", "camiseta", "zapato", "guante", "gorra", "media", "short", "casco",
+    "raqueta", "red", "botella", "mochila", "rodillera", "silbato", "cono", "pesa",
+    "adidas", "nike", "puma", "umbro", "joma", "rojo", "azul", "verde", "negro",
+    "blanco", "oficial", "réplica", "junior", "pro", "clásico", "edición",
+]
+
+
+def generar_productos(n: int, semilla: int = 42) -> List[Producto]:
+    rnd = random.Random(semilla)
+    productos = []
+    for i in range(n):
+        nombre = " ".join(rnd.sample(PALABRAS, 3)) + f" {rnd.randint(1990, 2030)}"
+        productos.append(Producto(f"P{i}", nombre, rnd.randint(0, 500), round(rnd.uniform(1, 500), 2)))
+    return productos
+
+
+def generar_inventario(n: int) -> Inventario:
+    inv = Inventario()
+    for p in generar_productos(n):
+        inv.agregar_producto(p)
+    return inv
+
+
+def medir(funcion: Callable[[], object], repeticiones: int = 1) -> float:
+    """Retorna el tiempo promedio (segundos) de `repeticiones` llamadas."""
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) / repeticiones
+
+
+# -------------------------
+# Mediciones
+# -------------------------
+
+def bench_busqueda(n: int) -> None:
+    """Búsqueda parcial por nombre (índice de trigramas vs recorrido completo)."""
+    inv = generar_inventario(n)
+    consultas = ["balón adidas", "réplica 201", "junior", "puma ro", "zzz"]
+
+    def recorrido_completo(consulta: str) -> list:
+        return [p for p in inv.productos.values() if consulta in inv._norm(p.get_nombre())]
+
+    print(f"\n[busqueda] {n} productos")
+    for consulta in consultas:
+        con_indice = medir(lambda: inv.buscar_por_nombre(consulta), repeticiones=5)
+        sin_indice = medir(lambda: recorrido_completo(consulta), repeticiones=1)
+        hits = len(inv.buscar_por_nombre(consulta))
+        print(f"  {consulta!r:16} hits={hits:7d}  índice={con_indice * 1000:9.3f} ms"
+              f"  recorrido={sin_indice * 1000:9.3f} ms")
+
+
+def bench_eliminacion(n: int) -> None:
+    """Eliminaciones secuenciales de todo el inventario (índice de nombres con conteo)."""
+    inv = generar_inventario(n)
+    ids = list(inv.productos)
+    random.Random(7).shuffle(ids)
+
+    # Costo de UNA reconstrucción completa del índice (lo que antes se hacía por eliminación)
+    reconstruccion = medir(lambda: {inv._norm(p.nombre) for p in inv.productos.values()})
+
+    inicio = time.perf_counter()
+    for pid in ids:
+        inv.eliminar_producto(pid)
+    total = time.perf_counter() - inicio
+
+    print(f"\n[eliminacion] {n} eliminaciones secuenciales")
+    print(f"  total={total:.3f} s  por eliminación={total / n * 1e6:.2f} µs")
+    print(f"  reconstruir el índice una vez={reconstruccion * 1000:.2f} ms"
+          f" (~{reconstruccion * n / 2:.0f} s estimados reconstruyendo en cada eliminación)")
+    assert not inv.productos and not inv._nombres_index and not inv._trigramas
+
+
+def bench_listado(n: int) -> None:
+    """Listado completo y paginado desde la vista ordenada vs ordenar en cada llamada."""
+    inv = generar_inventario(n)
+
+    def ordenar_cada_vez() -> list:
+        lista = list(inv.productos.values())
+        lista.sort(key=lambda p: (inv._norm(p.get_nombre()), p.get_id()))
+        return lista
+
+    assert inv.listar_todos() == ordenar_cada_vez()
+    print(f"\n[listado] {n} productos")
+    print(f"  listar_todos()            {medir(inv.listar_todos, 5) * 1000:9.3f} ms")
+    print(f"  ordenar en cada llamada   {medir(ordenar_cada_vez, 2) * 1000:9.3f} ms")
+    pagina = medir(lambda: inv.listar_todos(offset=n // 2, limit=50), 1000)
+    print(f"  página de 50 (a la mitad) {pagina * 1000:9.3f} ms")
+
+
+def bench_resumen(n: int) -> None:
+    """Resumen con totales acumulados vs recorrer todos los productos."""
+    inv = generar_inventario(n)
+    rnd = random.Random(3)
+    for pid in rnd.sample(list(inv.productos), min(n, 10_000)):
+        inv.actualizar_producto(pid, nueva_cantidad=rnd.randint(0, 500), nuevo_precio=rnd.uniform(1, 500))
+
+    print(f"\n[resumen] {n} productos (tras 10k actualizaciones)")
+    print(f"  resumen_inventario()  {medir(inv.resumen_inventario, 10_000) * 1e6:9.3f} µs")
+    print(f"  verificar_resumen()   {medir(inv.verificar_resumen, 3) * 1000:9.3f} ms")
+    print(f"  consistente: {inv.verificar_resumen()}")
+
+    # Un producto de este inventario no puede agregarse a otro (dejaría índices viejos)
+    compartido = next(iter(inv.productos.values()))
+    try:
+        Inventario().agregar_producto(compartido)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Se aceptó un producto que ya pertenece a otro inventario.")
+    compartido.set_cantidad(compartido.get_cantidad() + 1)
+    assert inv.verificar_resumen()
+
+    # Una copia no pertenece a ningún inventario: se puede modificar y agregar a otro
+    copia = copy.copy(compartido)
+    copia.set_cantidad(copia.get_cantidad() + 1)
+    Inventario().agregar_producto(copia)
+    assert len(pickle.dumps(compartido)) < 1024  # no arrastra el inventario entero
+    assert inv.verificar_resumen()
+
+
+def bench_journal(n: int) -> None:
+    """Latencia por cambio: journal de solo-anexar vs reescribir todo el JSON."""
+    inv = generar_inventario(n)
+    ids = list(inv.productos)
+    rnd = random.Random(5)
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, "inventario.json")
+        guardar_inventario(inv, ruta)
+
+        cambios = 20
+        reescritura = 0.0
+        for _ in range(cambios):
+            inv.actualizar_producto(rnd.choice(ids), nueva_cantidad=rnd.randint(0, 500))
+            reescritura += medir(lambda: guardar_inventario(inv, ruta))
+        reescritura /= cambios
+
+        journal = Journal(inv, ruta, umbral_bytes=1 << 62)  # sin compactar durante la medición
+        cambios = 20_000
+        inicio = time.perf_counter()
+        for _ in range(cambios):
+            inv.actualizar_producto(rnd.choice(ids), nueva_cantidad=rnd.randint(0, 500))
+        con_journal = (time.perf_counter() - inicio) / cambios
+
+        compactacion = medir(journal.compactar)
+        journal.cerrar()
+        assert cargar_inventario(ruta).to_dict() == inv.to_dict()
+
+    print(f"\n[journal] {n} productos")
+    print(f"  reescribir JSON por cambio   {reescritura * 1000:10.3f} ms")
+    print(f"  journal por cambio           {con_journal * 1000:10.3f} ms")
+    print(f"  compactación                 {compactacion * 1000:10.3f} ms")
+
+
+def medir_memoria(funcion: Callable[[], object]) -> Tuple[float, int]:
+    """Retorna (segundos, pico de memoria en bytes) de una llamada."""
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    resultado = funcion()
+    segundos = time.perf_counter() - inicio
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del resultado
+    return segundos, pico
+
+
+def bench_carga(n: int) -> None:
+    """Carga/guardado JSON: documento completo (json.load/dump) vs streaming."""
+    inv = generar_inventario(n)
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, "inventario.json")
+
+        def guardar_completo() -> None:
+            with open(ruta, "w", encoding="utf-8") as f:
+                json.dump(inv.to_dict(), f, ensure_ascii=False, indent=2)
+
+        def cargar_completo() -> Inventario:
+            with open(ruta, "r", encoding="utf-8") as f:
+                return Inventario.from_dict(json.load(f))
+
+        filas = []
+        for nombre, funcion in [
+            ("guardar json.dump", guardar_completo),
+            ("guardar streaming", lambda: guardar_inventario(inv, ruta)),
+            ("cargar json.load", cargar_completo),
+            ("cargar streaming", lambda: cargar_inventario(ruta)),
+        ]:
+            segundos = medir(funcion)
+            pico = medir_memoria(funcion)[1]  # tracemalloc es lento: el tiempo se mide aparte
+            filas.append((nombre, segundos, pico))
+        tam = os.path.getsize(ruta)
+
+    mb = 1024 * 1024
+    print(f"\n[carga] {n} productos, archivo de {tam / mb:.1f} MB (pico de memoria con tracemalloc)")
+    for nombre, segundos, pico in filas:
+        print(f"  {nombre:22} {segundos:7.3f} s  pico={pico / mb:8.1f} MB")
+
+
+def bench_binario(n: int) -> None:
+    """Arranque en frío: snapshot JSON vs binario (.invb)."""
+    import binario
+
+    inv = generar_inventario(n)
+    productos = list(inv.productos.values())
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta_json = os.path.join(carpeta, "inventario.json")
+        ruta_bin = os.path.join(carpeta, "inventario.invb")
+        guardar_inventario(inv, ruta_json)
+        t_guardar_bin = medir(lambda: guardar_inventario(inv, ruta_bin))
+        tam_json, tam_bin = os.path.getsize(ruta_json), os.path.getsize(ruta_bin)
+
+        def decodificar_json() -> list:
+            with open(ruta_json, "r", encoding="utf-8") as f:
+                return [Producto.from_dict(d) for d in json.load(f)["productos"]]
+
+        def decodificar_bin() -> list:
+            with open(ruta_bin, "rb") as f:
+                return binario.leer_binario(f.read())
+
+        assert decodificar_bin() == productos
+        t_dec_json, t_dec_bin = medir(decodificar_json), medir(decodificar_bin)
+        t_cargar_json = medir(lambda: cargar_inventario(ruta_json))
+        t_cargar_bin = medir(lambda: cargar_inventario(ruta_bin))
+
+    mb = 1024 * 1024
+    print(f"\n[binario] {n} productos: JSON={tam_json / mb:.1f} MB  binario={tam_bin / mb:.1f} MB"
+          f"  (guardar binario {t_guardar_bin:.3f} s)")
+    print(f"  leer archivo -> Producto      JSON {t_dec_json:7.3f} s   binario {t_dec_bin:7.3f} s")
+    print(f"  cargar_inventario (+índices)  JSON {t_cargar_json:7.3f} s   binario {t_cargar_bin:7.3f} s")
+
+
+def rss_actual_mb() -> float:
+    """Memoria residente del proceso (Linux); -1 si no está disponible."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for linea in f:
+                if linea.startswith("VmRSS:"):
+                    return int(linea.split()[1]) / 1024
+    except OSError:
+        pass
+    return -1.0
+
+
+def bench_solo_lectura(n: int) -> None:
+    """Réplica de solo lectura con mmap vs cargar el inventario completo."""
+    from inventario_solo_lectura import InventarioSoloLectura
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, "inventario.invb")
+        inv = generar_inventario(n)
+        guardar_inventario(inv, ruta)
+        esperado = inv.resumen_inventario()
+        del inv
+
+        rss_inicial = rss_actual_mb()
+        inicio = time.perf_counter()
+        replica = InventarioSoloLectura(ruta)
+        t_abrir = time.perf_counter() - inicio
+
+        ids = [f"P{random.Random(9).randrange(n)}" for _ in range(1000)]
+        t_obtener = medir(lambda: [replica.obtener_producto(pid) for pid in ids]) / len(ids)
+        rss_lookups = rss_actual_mb()
+        t_resumen = medir(replica.resumen_inventario)
+        assert replica.resumen_inventario() == esperado
+        rss_resumen = rss_actual_mb()
+        replica.cerrar()
+
+        # Cambios que quedaron solo en el journal: la réplica los re-aplica al abrir
+        inv = cargar_inventario(ruta)
+        journal = Journal(inv, ruta, umbral_bytes=1 << 62)
+        inv.eliminar_producto("P0")
+        inv.actualizar_producto(f"P{n - 1}", nueva_cantidad=0, nuevo_precio=1.5)
+        inv.agregar_producto(Producto("NUEVO", "agregado tras el snapshot", 3, 2.25))
+        journal.cerrar()
+        with InventarioSoloLectura(ruta) as replica:
+            assert replica.resumen_inventario() == inv.resumen_inventario()
+            assert replica.obtener_producto("P0") is None
+            assert replica.obtener_producto("NUEVO") == inv.obtener_producto("NUEVO")
+            assert len(replica) == len(inv.productos)
+        del inv
+
+        t_cargar = medir(lambda: cargar_inventario(ruta))
+
+    print(f"\n[solo_lectura] {n} productos")
+    print(f"  abrir (mmap)                  {t_abrir * 1000:9.3f} ms")
+    print(f"  obtener_producto              {t_obtener * 1e6:9.3f} µs")
+    print(f"  resumen_inventario            {t_resumen * 1000:9.3f} ms")
+    print(f"  cargar_inventario completo    {t_cargar * 1000:9.3f} ms")
+    print(f"  RSS: inicial {rss_inicial:.0f} MB, tras 1000 lecturas {rss_lookups:.0f} MB,"
+          f" tras resumen {rss_resumen:.0f} MB")
+
+
+@dataclass
+class ProductoConDict:
+    """Mismos campos que Producto, pero sin slots (con __dict__ por instancia)."""
+    id: str
+    nombre: str
+    cantidad: int
+    precio: float
+    _inventario: Optional[object] = field(default=None, init=False, repr=False, compare=False)
+
+
+def bench_memoria(n: int) -> None:
+    """Bytes por instancia: Producto (slots) vs dataclass con __dict__."""
+    fuentes = [(p.id, p.nombre, p.cantidad, p.precio) for p in generar_productos(n)]
+
+    print(f"\n[memoria] {n} instancias (sin contar los textos, que son compartidos)")
+    for clase in (ProductoConDict, Producto):
+        tracemalloc.start()
+        instancias = [clase(*datos) for datos in fuentes]
+        actual = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        lista = sys.getsizeof(instancias)
+        print(f"  {clase.__name__:16} {(actual - lista) / n:7.1f} bytes por producto")
+        del instancias
+
+
+def bench_columnar(n: int) -> None:
+    """InventarioColumnar (arrays) vs Inventario (dict de dataclasses)."""
+    from inventario_columnar import InventarioColumnar
+
+    productos = generar_productos(n)
+    copias = [Producto(p.id, p.nombre, p.cantidad, p.precio) for p in productos]
+
+    inicio = time.perf_counter()
+    col = InventarioColumnar()
+    for p in copias:
+        col.agregar_producto(p)
+    t_col = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    inv = Inventario()
+    for p in productos:
+        inv.agregar_producto(p)
+    t_inv = time.perf_counter() - inicio
+
+    valores = list(inv.productos.values())
+    # El primer filtro arma los índices (valor, fila); después se mantienen solos
+    t_indices = medir(lambda: (col.stock_bajo(0), col.rango_precio(0, 0)))
+    consultas = [
+        ("resumen (recorrido)",
+         col.resumen_inventario,
+         lambda: (len(valores), sum(p.cantidad for p in valores),
+                  round(math.fsum(p.cantidad * p.precio for p in valores), 2))),
+        ("stock_bajo(5)",
+         lambda: col.stock_bajo(5),
+         lambda: [p for p in valores if p.cantidad < 5]),
+        ("precio 100..300",
+         lambda: col.rango_precio(100, 300),
+         lambda: [p for p in valores if 100 <= p.precio <= 300]),
+        ("precio + copias",
+         lambda: col.rango_precio(100, 300).productos(),
+         lambda: [p for p in valores if 100 <= p.precio <= 300]),
+        ("buscar 'junior'",
+         lambda: col.buscar_por_nombre("junior"),
+         lambda: inv.buscar_por_nombre("junior")),
+    ]
+
+    print(f"\n[columnar] {n} filas")
+    print(f"  {'agregar todo':22} columnar {t_col:8.3f} s     dict {t_inv:8.3f} s")
+    print(f"  {'armar índices filtros':22} columnar {t_indices * 1000:8.2f} ms   (una vez)")
+    for nombre, f_col, f_dict in consultas:
+        esperado = f_dict()
+        assert f_col() == esperado if isinstance(esperado, tuple) else len(f_col()) == len(esperado)
+        print(f"  {nombre:22} columnar {medir(f_col, 3) * 1000:8.2f} ms    dict {medir(f_dict, 3) * 1000:8.2f} ms")
+    print(f"  {'resumen_inventario()':22} dict con acumulados {medir(inv.resumen_inventario, 1000) * 1e6:.2f} µs")
+
+
+def bench_lote(n: int) -> None:
+    """Importación CSV por lotes (agregar_lote) vs agregar_producto fila por fila."""
+    import csv
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, "productos.csv")
+        origen = Inventario()
+        origen.agregar_lote(generar_productos(n))
+        t_exportar = medir(lambda: exportar_csv(origen, ruta))
+        del origen
+
+        def uno_por_uno() -> Inventario:
+            inv = Inventario()
+            with open(ruta, "r", encoding="utf-8", newline="") as f:
+                for fila in csv.DictReader(f):
+                    inv.agregar_producto(Producto.from_dict(fila))
+            return inv
+
+        def por_lotes() -> Inventario:
+            inv = Inventario()
+            importar_csv(inv, ruta)
+            return inv
+
+        t_uno, m_uno = medir(uno_por_uno), medir_memoria(uno_por_uno)[1]
+        t_lote, m_lote = medir(por_lotes), medir_memoria(por_lotes)[1]
+
+    mb = 1024 * 1024
+    print(f"\n[lote] {n} filas CSV (exportar {t_exportar:.3f} s)")
+    print(f"  agregar_producto por fila  {t_uno:7.3f} s  pico={m_uno / mb:8.1f} MB")
+    print(f"  importar_csv (agregar_lote){t_lote:7.3f} s  pico={m_lote / mb:8.1f} MB")
+
+
+def bench_rangos(n: int) -> None:
+    """Consultas por rango con índices secundarios vs recorrido completo."""
+    inv = generar_inventario(n)
+    valores = list(inv.productos.values())
+    t_activar = medir(inv.activar_indices_rango)
+
+    consultas = [
+        ("stock_bajo(5)", lambda: inv.stock_bajo(5),
+         lambda: [p for p in valores if p.cantidad < 5]),
+        ("precio 100..101", lambda: inv.rango_precio(100, 101),
+         lambda: [p for p in valores if 100 <= p.precio <= 101]),
+        ("precio 100..300", lambda: inv.rango_precio(100, 300),
+         lambda: [p for p in valores if 100 <= p.precio <= 300]),
+    ]
+    print(f"\n[rangos] {n} productos (activar índices {t_activar * 1000:.1f} ms)")
+    for nombre, con_indice, recorrido in consultas:
+        assert len(con_indice()) == len(recorrido())
+        print(f"  {nombre:18} k={len(con_indice()):7d}  índice={medir(con_indice, 20) * 1000:8.3f} ms"
+              f"  recorrido={medir(recorrido, 3) * 1000:8.3f} ms")
+
+    ids = list(inv.productos)
+    rnd = random.Random(11)
+    t_actualizar = medir(lambda: inv.actualizar_producto(rnd.choice(ids), nueva_cantidad=rnd.randint(0, 500)), 10_000)
+    print(f"  actualizar_producto con índices  {t_actualizar * 1e6:.2f} µs")
+
+
+def bench_concurrencia(n: int) -> None:
+    """Tráfico mixto desde 1 a 16 hilos sobre InventarioConcurrente (throughput e invariantes)."""
+    operaciones = 200_000
+    print(f"\n[concurrencia] {n} productos, {operaciones} operaciones repartidas entre los hilos")
+    for hilos in (1, 2, 4, 8, 16):
+        inv = InventarioConcurrente(generar_inventario(n))
+        ids = list(inv._inv.productos)
+        _, unidades_iniciales, _ = inv.resumen_inventario()
+        errores: List[BaseException] = []
+
+        def trabajador(indice: int) -> None:
+            rnd = random.Random(indice)
+            propio = f"TMP-{indice}"
+            try:
+                for _ in range(operaciones // hilos):
+                    pid = rnd.choice(ids)
+                    r = rnd.random()
+                    if r < 0.80:
+                        # reserva + devolución: las unidades totales no deberían cambiar
+                        unidades = rnd.randint(1, 5)
+                        if inv.reservar_stock(pid, unidades):
+                            inv.reponer_stock(pid, unidades)
+                    elif r < 0.95:
+                        inv.obtener_producto(pid)
+                    elif r < 0.99:
+                        inv.listar_todos(offset=rnd.randrange(n), limit=20)
+                        inv.resumen_inventario()
+                    elif inv.obtener_producto(propio) is not None:
+                        inv.eliminar_producto(propio)  # alta/baja: lock exclusivo
+                    else:
+                        inv.agregar_producto(Producto(propio, "temporal", 1, 1.0))
+                if inv.obtener_producto(propio) is not None:
+                    inv.eliminar_producto(propio)
+            except BaseException as e:  # se reporta al final
+                errores.append(e)
+
+        trabajadores = [threading.Thread(target=trabajador, args=(i,)) for i in range(hilos)]
+        inicio = time.perf_counter()
+        for t in trabajadores:
+            t.start()
+        for t in trabajadores:
+            t.join()
+        segundos = time.perf_counter() - inicio
+
+        _, unidades_finales, _ = inv.resumen_inventario()
+        consistente = not errores and unidades_finales == unidades_iniciales and inv.verificar_resumen()
+        print(f"  {hilos:2d} hilos  {operaciones / segundos:10.0f} ops/s"
+              f"  {'consistente' if consistente else f'INCONSISTENTE {errores[:1]}'}")
+
+
+def bench_servidor(n: int) -> None:
+    """Servidor TCP de AsyncInventario con miles de clientes concurrentes (localhost)."""
+    clientes, peticiones = 2_000, 20
+
+    async def cliente(puerto: int, indice: int, ids: List[str], latencias: List[float]) -> None:
+        rnd = random.Random(indice)
+        reader, writer = await asyncio.open_connection("127.0.0.1", puerto)
+        for _ in range(peticiones):
+            r = rnd.random()
+            if r < 0.75:
+                peticion = {"op": "obtener", "id": rnd.choice(ids)}
+            elif r < 0.80:
+                nombre = " ".join(rnd.sample(PALABRAS, 2))
+                peticion = {"op": "buscar", "nombre": nombre, "limit": 20}
+            else:
+                peticion = {"op": "actualizar", "id": rnd.choice(ids), "cantidad": rnd.randint(0, 500)}
+            inicio = time.perf_counter()
+            writer.write(json.dumps(peticion).encode("utf-8") + b"\n")
+            respuesta = json.loads(await reader.readline())
+            latencias.append(time.perf_counter() - inicio)
+            assert respuesta["ok"], respuesta
+        writer.close()
+        await writer.wait_closed()
+
+    async def correr(ruta: str) -> Tuple[float, List[float], int]:
+        inv = generar_inventario(n)
+        ids = list(inv.productos)
+        latencias: List[float] = []
+        async with AsyncInventario(inv, ruta, retardo_guardado=0.5) as fachada:
+            servidor = await fachada.servir("127.0.0.1", 0)
+            puerto = servidor.sockets[0].getsockname()[1]
+            inicio = time.perf_counter()
+            await asyncio.gather(*(cliente(puerto, i, ids, latencias) for i in range(clientes)))
+            segundos = time.perf_counter() - inicio
+            servidor.close()
+            await servidor.wait_closed()
+        return segundos, latencias, os.path.getsize(ruta)
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        segundos, latencias, tam = asyncio.run(correr(os.path.join(carpeta, "inventario.json")))
+    latencias.sort()
+    total = clientes * peticiones
+    print(f"\n[servidor] {n} productos, {clientes} clientes x {peticiones} peticiones")
+    print(f"  {total / segundos:10.0f} peticiones/s"
+          f"  p50={latencias[total // 2] * 1000:.1f} ms  p99={latencias[total * 99 // 100] * 1000:.1f} ms"
+          f"  (snapshot final {tam / 1024 / 1024:.1f} MB)")
+
+
+MEDICIONES: Dict[str, Callable[[int], None]] = {
+    "busqueda": bench_busqueda,
+    "eliminacion": bench_eliminacion,
+    "listado": bench_listado,
+    "resumen": bench_resumen,
+    "journal": bench_journal,
+    "carga": bench_carga,
+    "binario": bench_binario,
+    "solo_lectura": bench_solo_lectura,
+    "memoria": bench_memoria,
+    "columnar": bench_columnar,
+    "lote": bench_lote,
+    "rangos": bench_rangos,
+    "concurrencia": bench_concurrencia,
+    "servidor": bench_servidor,
+}
+
+
+def main() -> None:
+    nombre = sys.argv[1] if len(sys.argv) > 1 else None
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+
+    if nombre is None:
+        for funcion in MEDICIONES.values():
+            funcion(n)
+    elif nombre in MEDICIONES:
+        MEDICIONES[nombre](n)
+    else:
+        print(f"Medición desconocida. Opciones: {', '.join(MEDICIONES)}")
+
+
+if __name__ == "__main__":
+    main()
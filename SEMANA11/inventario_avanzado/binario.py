@@ -0,0 +1,164 @@
+"""
+Formato binario compacto para el snapshot del inventario (.invb).
+
+Estructura (little-endian):
+  - Encabezado: firma b"INVB", versión, cantidad de productos,
+    largo en bytes de las tablas de texto y CRC32 de todo lo que sigue.
+  - Columna cantidad: n enteros int64.
+  - Columna precio:   n flotantes float64.
+  - Tabla de IDs:     n+1 offsets uint64 + bytes UTF-8 separados por NUL.
+  - Tabla de nombres: igual que la de IDs.
+  - (versión 2) Índice de IDs: n enteros uint64 con los números de fila
+    ordenados por ID, para buscar por ID con búsqueda binaria sobre el archivo.
+
+Las columnas numéricas y los offsets se cargan de una vez con array.frombytes
+y cada tabla de texto se decodifica en una sola llamada (decode + split).
+"""
+from __future__ import annotations
+
+import struct
+import sys
+import zlib
+from array import array
+from dataclasses import dataclass
+from typing import BinaryIO, List, Sequence, Tuple
+
+from producto import Producto
+from utilidades import gc_pausado
+
+FIRMA = b"INVB"
+VERSION = 2
+VERSIONES_SOPORTADAS = (1, 2)
+EXTENSION = ".invb"
+
+# firma, versión, (relleno), n, bytes_ids, bytes_nombres, crc32
+_ENCABEZADO = struct.Struct("<4sH2xQQQI")
+TAM_ENCABEZADO = _ENCABEZADO.size
+_SEPARADOR = "\0"
+
+
+@dataclass(frozen=True)
+class Disposicion:
+    """Posición (offset absoluto en bytes) de cada sección de un archivo .invb."""
+    version: int
+    n: int
+    crc: int
+    cantidades: int
+    precios: int
+    offsets_ids: int
+    ids: int
+    offsets_nombres: int
+    nombres: int
+    fin_nombres: int
+    indice_ids: int  # -1 en la versión 1 (sin índice)
+    fin: int
+
+
+def leer_encabezado(datos: bytes) -> Disposicion:
+    """
+    Lee el encabezado y calcula dónde empieza cada sección, sin tocar el resto
+    del archivo (sirve igual para bytes en memoria que para un mmap).
+    """
+    if len(datos) < _ENCABEZADO.size:
+        raise ValueError("Archivo binario demasiado corto.")
+    firma, version, n, bytes_ids, bytes_nombres, crc = _ENCABEZADO.unpack_from(datos)
+    if firma != FIRMA:
+        raise ValueError("No es un inventario binario (firma inválida).")
+    if version not in VERSIONES_SOPORTADAS:
+        raise ValueError(f"Versión de formato no soportada: {version}.")
+
+    cantidades = _ENCABEZADO.size
+    precios = cantidades + 8 * n
+    offsets_ids = precios + 8 * n
+    ids = offsets_ids + 8 * (n + 1)
+    offsets_nombres = ids + bytes_ids
+    nombres = offsets_nombres + 8 * (n + 1)
+    fin_nombres = nombres + bytes_nombres
+    indice_ids = -1
+    fin = fin_nombres
+    if version >= 2:
+        indice_ids = fin_nombres
+        fin = indice_ids + 8 * n
+
+    if len(datos) < fin:
+        raise ValueError("Archivo binario truncado.")
+    return Disposicion(version, n, crc, cantidades, precios, offsets_ids, ids,
+                       offsets_nombres, nombres, fin_nombres, indice_ids, fin)
+
+
+def _a_little_endian(columna: array) -> bytes:
+    if sys.byteorder == "big":
+        columna = array(columna.typecode, columna)
+        columna.byteswap()
+    return columna.tobytes()
+
+
+def columna_desde_bytes(typecode: str, datos: bytes) -> array:
+    """Convierte una sección little-endian del archivo en un array nativo."""
+    columna = array(typecode)
+    columna.frombytes(datos)
+    if sys.byteorder == "big":
+        columna.byteswap()
+    return columna
+
+
+def _tabla_texto(textos: Sequence[str]) -> Tuple[array, bytes]:
+    """Retorna (offsets, bytes) de una tabla de textos separados por NUL."""
+    offsets = array("Q", [0])
+    partes = []
+    total = 0
+    for texto in textos:
+        if _SEPARADOR in texto:
+            raise ValueError(f"El texto {texto!r} contiene un carácter NUL.")
+        codificado = texto.encode("utf-8") + b"\0"
+        partes.append(codificado)
+        total += len(codificado)
+        offsets.append(total)
+    return offsets, b"".join(partes)
+
+
+def escribir_binario(productos: Sequence[Producto], f: BinaryIO) -> None:
+    cantidades = array("q", (p.get_cantidad() for p in productos))
+    precios = array("d", (p.get_precio() for p in productos))
+    offsets_ids, ids = _tabla_texto([p.get_id() for p in productos])
+    offsets_nombres, nombres = _tabla_texto([p.get_nombre() for p in productos])
+    ids_texto = [p.get_id() for p in productos]
+    indice_ids = array("Q", sorted(range(len(productos)), key=ids_texto.__getitem__))
+
+    secciones = [
+        _a_little_endian(cantidades),
+        _a_little_endian(precios),
+        _a_little_endian(offsets_ids),
+        ids,
+        _a_little_endian(offsets_nombres),
+        nombres,
+        _a_little_endian(indice_ids),
+    ]
+    crc = 0
+    for seccion in secciones:
+        crc = zlib.crc32(seccion, crc)
+
+    f.write(_ENCABEZADO.pack(FIRMA, VERSION, len(productos), len(ids), len(nombres), crc))
+    for seccion in secciones:
+        f.write(seccion)
+
+
+def leer_binario(datos: bytes) -> List[Producto]:
+    """
+    Reconstruye los productos desde el contenido completo de un archivo .invb.
+    Lanza ValueError si la firma, la versión o el checksum no coinciden.
+    """
+    d = leer_encabezado(datos)
+    vista = memoryview(datos)
+    if zlib.crc32(vista[_ENCABEZADO.size:d.fin]) != d.crc:
+        raise ValueError("Checksum inválido: el archivo está corrupto.")
+
+    cantidades = columna_desde_bytes("q", vista[d.cantidades:d.precios])
+    precios = columna_desde_bytes("d", vista[d.precios:d.offsets_ids])
+    ids = str(vista[d.ids:d.offsets_nombres], "utf-8").split(_SEPARADOR)
+    nombres = str(vista[d.nombres:d.fin_nombres], "utf-8").split(_SEPARADOR)
+
+    # Cada tabla termina en NUL, así que split deja un "" extra al final
+    # (map se detiene en la columna más corta, que tiene exactamente n elementos).
+    with gc_pausado():
+        return list(map(Producto, ids, nombres, cantidades, precios))
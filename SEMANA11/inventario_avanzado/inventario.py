@@ -1,6 +1,12 @@
 from __future__ import annotations
-from typing import Dict, List, Optional, Tuple, Set
+import heapq
+import math
+from contextlib import nullcontext
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Tuple, Set, Union
+from lista_ordenada import ListaOrdenada
 from producto import Producto
+from utilidades import gc_pausado
 
 
 class Inventario:
@@ -8,36 +14,238 @@ class Inventario:
     Inventario basado en diccionario para búsqueda rápida:
       productos: Dict[str, Producto]  -> clave = ID único
     Además usamos:
-      - set para indexar nombres normalizados
-      - list para ordenar resultados al mostrar
+      - dict nombre normalizado -> conteo (índice de nombres con referencias)
+      - dict trigrama -> set de IDs (índice invertido para búsquedas parciales)
+      - ListaOrdenada (por bloques) de (nombre normalizado, ID) para listar
+        sin reordenar; altas y bajas no pagan un memmove de O(N)
       - tuple para devolver resúmenes inmutables
+      - acumulados de unidades y valor para resumir en O(1)
+      - (opcional) ListaOrdenada por (cantidad, ID) y (precio, ID) para
+        consultas por rango en O(log N + k)
     """
 
-    def __init__(self) -> None:
+    def __init__(self, indices_rango: bool = False) -> None:
         self.productos: Dict[str, Producto] = {}
-        self._nombres_index: Set[str] = set()
+        # Nombre normalizado -> cuántos productos lo usan (conteo de referencias)
+        self._nombres_index: Dict[str, int] = {}
+        # Índice invertido: trigrama -> IDs cuyo nombre normalizado lo contiene
+        self._trigramas: Dict[str, Set[str]] = {}
+        # Nombre normalizado por ID (evita re-normalizar en cada búsqueda)
+        self._nombres_norm: Dict[str, str] = {}
+        # Vista ordenada (nombre normalizado, ID)
+        self._orden = ListaOrdenada()
+        # Durante una carga masiva la vista ordenada se arma una sola vez al final
+        self._carga_masiva = False
+        # Totales acumulados que alimentan resumen_inventario()
+        self._unidades: int = 0
+        self._valor: float = 0.0
+        # Journal de cambios (ver storage.Journal); None = sin registro
+        self._journal = None
+        # Índices secundarios por rango; None = desactivados
+        # (el Producto va al final: nunca se compara porque (valor, ID) es único)
+        self._por_cantidad: Optional[ListaOrdenada] = None  # de (cantidad, ID, Producto)
+        self._por_precio: Optional[ListaOrdenada] = None    # de (precio, ID, Producto)
+        if indices_rango:
+            self.activar_indices_rango()
+
+    def __setstate__(self, estado: dict) -> None:
+        # Los Productos se serializan sin su referencia al inventario: se restaura
+        self.__dict__.update(estado)
+        for producto in self.productos.values():
+            producto._inventario = self
 
     @staticmethod
     def _norm(texto: str) -> str:
         return texto.strip().lower()
 
-    def _reconstruir_index(self) -> None:
-        self._nombres_index = {self._norm(p.nombre) for p in self.productos.values()}
+    @staticmethod
+    def _trigramas_de(texto: str) -> Set[str]:
+        return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+    def _indexar_nombre(self, pid: str, nombre: str) -> None:
+        nombre_norm = self._norm(nombre)
+        self._nombres_norm[pid] = nombre_norm
+        if self._carga_masiva:
+            self._orden.agregar_diferido((nombre_norm, pid))
+        else:
+            self._orden.agregar((nombre_norm, pid))
+        self._nombres_index[nombre_norm] = self._nombres_index.get(nombre_norm, 0) + 1
+        for tri in self._trigramas_de(nombre_norm):
+            self._trigramas.setdefault(tri, set()).add(pid)
+
+    def _desindexar_nombre(self, pid: str) -> None:
+        nombre_norm = self._nombres_norm.pop(pid, None)
+        if nombre_norm is None:
+            return
+
+        if not self._carga_masiva:
+            self._orden.quitar((nombre_norm, pid))
+
+        restantes = self._nombres_index.get(nombre_norm, 0) - 1
+        if restantes > 0:
+            self._nombres_index[nombre_norm] = restantes
+        else:
+            self._nombres_index.pop(nombre_norm, None)
+
+        for tri in self._trigramas_de(nombre_norm):
+            ids = self._trigramas.get(tri)
+            if ids is None:
+                continue
+            ids.discard(pid)
+            if not ids:
+                del self._trigramas[tri]
+
+    def _candidatos(self, consulta: str) -> Iterable[str]:
+        """
+        IDs que podrían contener la consulta.
+        Con 3+ caracteres intersectamos los trigramas (empezando por el más raro);
+        con consultas más cortas no hay trigramas y se recorre todo.
+        """
+        if len(consulta) < 3:
+            return self._nombres_norm.keys()
+
+        conjuntos = []
+        for tri in self._trigramas_de(consulta):
+            ids = self._trigramas.get(tri)
+            if not ids:
+                return ()
+            conjuntos.append(ids)
+
+        conjuntos.sort(key=len)
+        return conjuntos[0].intersection(*conjuntos[1:])
+
+    def _reemplazar(self, pid: str, producto: Producto) -> None:
+        """Cambia el objeto de un ID existente conservando su posición en el dict."""
+        self._verificar_sin_inventario(producto)
+        self._quitar_de_indices(pid, self.productos[pid])
+        self.productos[pid] = producto
+        self._agregar_a_indices(pid, producto)
+
+    def _agregar_a_indices(self, pid: str, producto: Producto) -> None:
+        self._indexar_nombre(pid, producto.get_nombre())
+        self._indexar_rango(self._por_cantidad, producto.get_cantidad(), pid, producto)
+        self._indexar_rango(self._por_precio, producto.get_precio(), pid, producto)
+        self._acumular(producto, +1)
+        producto._inventario = self
+
+    def _quitar_de_indices(self, pid: str, producto: Producto) -> None:
+        self._desindexar_nombre(pid)
+        self._desindexar_rango(self._por_cantidad, producto.get_cantidad(), pid)
+        self._desindexar_rango(self._por_precio, producto.get_precio(), pid)
+        self._acumular(producto, -1)
+        producto._inventario = None
+
+    def _indexar_rango(self, indice: Optional[ListaOrdenada], valor, pid: str, producto: Producto) -> None:
+        if indice is None:
+            return
+        if self._carga_masiva:
+            indice.agregar_diferido((valor, pid, producto))  # se ordena al terminar la carga
+        else:
+            indice.agregar((valor, pid, producto))
+
+    @staticmethod
+    def _desindexar_rango(indice: Optional[ListaOrdenada], valor, pid: str) -> None:
+        if indice is not None:
+            # (valor, pid) es menor que (valor, pid, producto): bisect cae justo en él
+            indice.quitar((valor, pid))
+
+    def _acumular(self, producto: Producto, signo: int) -> None:
+        self._unidades += signo * producto.get_cantidad()
+        self._valor += signo * producto.get_cantidad() * producto.get_precio()
+
+    def _verificar_sin_inventario(self, producto: Producto) -> None:
+        """
+        Un Producto solo puede estar en un inventario: sus setters avisan a uno
+        solo, así que los índices del otro quedarían desactualizados.
+        """
+        if producto._inventario is not None and producto._inventario is not self:
+            raise ValueError(f"El producto '{producto.get_id()}' ya pertenece a otro inventario.")
+
+    def _insertar(self, pid: str, producto: Producto) -> None:
+        self._verificar_sin_inventario(producto)
+        self.productos[pid] = producto
+        self._agregar_a_indices(pid, producto)
+
+    def _quitar(self, pid: str) -> Producto:
+        producto = self.productos.pop(pid)
+        self._quitar_de_indices(pid, producto)
+        return producto
+
+    def _cambiar_campo(self, producto: Producto, campo: str, valor) -> None:
+        """
+        Lo llama Producto (vía sus setters) cuando pertenece a este inventario,
+        para que los índices se actualicen en O(1) en lugar de reconstruirse.
+        """
+        pid = self._id_de(producto)
+        if campo == "id":
+            if valor != pid and valor in self.productos:
+                raise ValueError(f"Ya existe un producto con ID '{valor}'.")
+            self._quitar(pid)
+            producto.id = valor
+            self._insertar(valor, producto)
+        elif campo == "nombre":
+            self._desindexar_nombre(pid)
+            producto.nombre = valor
+            self._indexar_nombre(pid, valor)
+        else:
+            # cantidad / precio: cambian los totales y su índice por rango
+            indice = self._por_cantidad if campo == "cantidad" else self._por_precio
+            self._acumular(producto, -1)
+            self._desindexar_rango(indice, getattr(producto, campo), pid)
+            setattr(producto, campo, valor)
+            self._indexar_rango(indice, valor, pid, producto)
+            self._acumular(producto, +1)
+        self._registrar({"op": "~", "id": pid, "p": producto.to_dict()})
+
+    def _registrar(self, registro: dict) -> None:
+        if self._journal is not None:
+            self._journal.registrar(registro)
+
+    def aplicar_registro(self, registro: dict) -> None:
+        """
+        Re-aplica un registro del journal:
+          {"op": "+", "p": {...}}            -> alta
+          {"op": "~", "id": ..., "p": {...}} -> cambio (el ID pudo cambiar)
+          {"op": "-", "id": ...}             -> baja
+        Los registros llevan el estado completo, así que re-aplicarlos es seguro
+        aunque el snapshot ya los incluya.
+        """
+        op = registro["op"]
+        if op in ("+", "~"):
+            prod = Producto.from_dict(registro["p"])
+            pid = prod.get_id().strip()
+            anterior = registro.get("id", pid)
+            if anterior != pid and anterior in self.productos:
+                self._quitar(anterior)
+            if pid in self.productos:
+                self._reemplazar(pid, prod)
+            else:
+                self._insertar(pid, prod)
+        elif op == "-":
+            if registro["id"] in self.productos:
+                self._quitar(registro["id"])
+        else:
+            raise ValueError(f"Operación de journal desconocida: '{op}'.")
+
+    def _id_de(self, producto: Producto) -> str:
+        pid = producto.get_id().strip()
+        if self.productos.get(pid) is not producto:
+            raise KeyError(f"El producto '{pid}' no pertenece a este inventario.")
+        return pid
 
     def agregar_producto(self, producto: Producto) -> None:
         pid = producto.get_id().strip()
         if pid in self.productos:
             raise ValueError(f"Ya existe un producto con ID '{pid}'.")
-        self.productos[pid] = producto
-        self._nombres_index.add(self._norm(producto.get_nombre()))
+        self._insertar(pid, producto)
+        self._registrar({"op": "+", "p": producto.to_dict()})
 
     def eliminar_producto(self, producto_id: str) -> None:
         pid = producto_id.strip()
         if pid not in self.productos:
             raise KeyError(f"No existe producto con ID '{pid}'.")
-        eliminado = self.productos.pop(pid)
-        # Reindex: forma segura cuando quitamos un elemento
-        self._reconstruir_index()
+        self._quitar(pid)
+        self._registrar({"op": "-", "id": pid})
 
     def actualizar_producto(
         self,
@@ -55,29 +263,140 @@ class Inventario:
         if nuevo_precio is not None:
             producto.set_precio(float(nuevo_precio))
 
-    def buscar_por_nombre(self, nombre: str) -> List[Producto]:
+    def agregar_lote(
+        self, items: Iterable[Union[Producto, dict]], pausar_gc: bool = True
+    ) -> List[Tuple[int, str]]:
+        """
+        Agrega muchos productos en una sola pasada (Producto o dict como en from_dict).
+        Las filas inválidas o con ID repetido se omiten y se informan como
+        (posición en `items`, motivo). Las vistas ordenadas se actualizan una sola vez.
+        pausar_gc=False para llamadas desde hilos (ver utilidades.gc_pausado).
+        """
+        rechazados: List[Tuple[int, str]] = []
+        self._carga_masiva = True
+        with gc_pausado() if pausar_gc else nullcontext():
+            try:
+                for i, item in enumerate(items):
+                    try:
+                        prod = item if isinstance(item, Producto) else Producto.from_dict(item)
+                        prod.validar()
+                    except KeyError as e:
+                        rechazados.append((i, f"Falta el campo {e}."))
+                        continue
+                    except (TypeError, ValueError) as e:
+                        rechazados.append((i, f"Fila inválida: {e}"))
+                        continue
+
+                    pid = prod.get_id().strip()
+                    if pid in self.productos:
+                        rechazados.append((i, f"Ya existe un producto con ID '{pid}'."))
+                        continue
+                    try:
+                        self._insertar(pid, prod)
+                    except ValueError as e:
+                        rechazados.append((i, str(e)))
+                        continue
+                    self._registrar({"op": "+", "p": prod.to_dict()})
+            finally:
+                self._carga_masiva = False
+                # Las vistas recibieron sus claves sin ordenar: se incorporan todas juntas
+                for indice in (self._orden, self._por_cantidad, self._por_precio):
+                    if indice is not None:
+                        indice.ordenar()
+        return rechazados
+
+    def actualizar_lote(self, items: Iterable[dict]) -> List[Tuple[int, str]]:
+        """
+        Actualiza muchos productos: cada item es {"id": ..., "cantidad"?: ..., "precio"?: ...}.
+        Retorna las filas rechazadas como (posición en `items`, motivo).
+        """
+        rechazados: List[Tuple[int, str]] = []
+        for i, item in enumerate(items):
+            if "id" not in item:
+                rechazados.append((i, "Falta el campo 'id'."))
+                continue
+            try:
+                cantidad = item.get("cantidad")
+                precio = item.get("precio")
+                cantidad = None if cantidad in (None, "") else int(cantidad)
+                precio = None if precio in (None, "") else float(precio)
+                # Validar todo antes de tocar el producto (la fila se aplica entera o no se aplica)
+                if cantidad is not None and cantidad < 0:
+                    raise ValueError("La cantidad no puede ser negativa.")
+                if precio is not None and precio < 0:
+                    raise ValueError("El precio no puede ser negativo.")
+                self.actualizar_producto(str(item["id"]), nueva_cantidad=cantidad, nuevo_precio=precio)
+            except KeyError as e:
+                rechazados.append((i, e.args[0]))  # el ID no existe
+            except (TypeError, ValueError) as e:
+                rechazados.append((i, f"Fila inválida: {e}"))
+        return rechazados
+
+    # -------- Consultas por rango --------
+
+    def activar_indices_rango(self) -> None:
+        """Construye los índices ordenados por cantidad y precio (O(N log N))."""
+        self._por_cantidad = ListaOrdenada((p.get_cantidad(), pid, p) for pid, p in self.productos.items())
+        self._por_precio = ListaOrdenada((p.get_precio(), pid, p) for pid, p in self.productos.items())
+
+    def _rango(self, indice: Optional[ListaOrdenada], campo: str, minimo, maximo) -> List[Producto]:
+        if indice is None:
+            # Sin índice: recorrido completo, ordenado igual que con índice
+            pares = sorted(
+                (getattr(p, campo), pid) for pid, p in self.productos.items()
+                if (minimo is None or getattr(p, campo) >= minimo)
+                and (maximo is None or getattr(p, campo) <= maximo)
+            )
+            return [self.productos[pid] for _, pid in pares]
+
+        return list(map(itemgetter(2), indice.rango(minimo, maximo, key=itemgetter(0))))
+
+    def rango_cantidad(self, minimo: Optional[int] = None, maximo: Optional[int] = None) -> List[Producto]:
+        """Productos con minimo <= cantidad <= maximo (None = sin límite), de menor a mayor."""
+        return self._rango(self._por_cantidad, "cantidad", minimo, maximo)
+
+    def rango_precio(self, minimo: Optional[float] = None, maximo: Optional[float] = None) -> List[Producto]:
+        """Productos con minimo <= precio <= maximo (None = sin límite), de menor a mayor."""
+        return self._rango(self._por_precio, "precio", minimo, maximo)
+
+    def stock_bajo(self, umbral: float) -> List[Producto]:
+        """
+        Productos con cantidad < umbral. Las cantidades son enteras: cantidad < umbral
+        equivale a cantidad <= ceil(umbral) - 1, también con un umbral decimal.
+        """
+        return self.rango_cantidad(maximo=math.ceil(umbral) - 1)
+
+    def buscar_por_nombre(self, nombre: str, limit: Optional[int] = None) -> List[Producto]:
         """
         Búsqueda por coincidencia parcial (contiene).
-        Retorna lista de productos encontrados.
+        Retorna lista de productos encontrados, ordenada por nombre.
+        Con `limit` solo se ordenan los primeros (heap de tamaño limit).
         """
         consulta = self._norm(nombre)
         if not consulta:
             return []
 
-        # Si la consulta exacta NO está en el set, igual podemos buscar parcial.
-        resultados = [
-            p for p in self.productos.values()
-            if consulta in self._norm(p.get_nombre())
+        # El índice de trigramas solo descarta candidatos: la verificación
+        # final "contiene" se hace sobre el nombre normalizado en caché.
+        coincidencias = [
+            (norm, pid) for pid in self._candidatos(consulta)
+            if consulta in (norm := self._nombres_norm[pid])
         ]
 
         # Orden alfabético por nombre
-        resultados.sort(key=lambda p: self._norm(p.get_nombre()))
-        return resultados
+        if limit is not None and limit < len(coincidencias):
+            coincidencias = heapq.nsmallest(limit, coincidencias)
+        else:
+            coincidencias.sort()
+        return [self.productos[pid] for _, pid in coincidencias]
 
-    def listar_todos(self) -> List[Producto]:
-        productos_lista = list(self.productos.values())
-        productos_lista.sort(key=lambda p: (self._norm(p.get_nombre()), p.get_id()))
-        return productos_lista
+    def listar_todos(self, offset: int = 0, limit: Optional[int] = None) -> List[Producto]:
+        """
+        Productos ordenados por (nombre, ID) desde la vista ya ordenada.
+        offset/limit permiten paginar sin recorrer el inventario completo.
+        """
+        fin = None if limit is None else offset + limit
+        return [self.productos[pid] for _, pid in self._orden.rebanada(offset, fin)]
 
     def obtener_producto(self, producto_id: str) -> Optional[Producto]:
         return self.productos.get(producto_id.strip())
@@ -86,11 +405,22 @@ class Inventario:
         """
         Retorna una tupla (inmutable) con:
         (cantidad_de_productos_distintos, unidades_totales, valor_total)
+        Se arma en O(1) a partir de los totales acumulados.
+        """
+        return (len(self.productos), self._unidades, round(self._valor, 2))
+
+    def verificar_resumen(self) -> bool:
+        """
+        Recalcula el resumen recorriendo todos los productos y lo compara
+        con los totales acumulados. Si difieren, corrige los acumulados.
+        Retorna True si eran consistentes.
         """
-        distintos = len(self.productos)
         unidades = sum(p.get_cantidad() for p in self.productos.values())
-        valor = sum(p.get_cantidad() * p.get_precio() for p in self.productos.values())
-        return (distintos, unidades, round(valor, 2))
+        valor = math.fsum(p.get_cantidad() * p.get_precio() for p in self.productos.values())
+        consistente = unidades == self._unidades and round(valor, 2) == round(self._valor, 2)
+        self._unidades = unidades
+        self._valor = valor
+        return consistente
 
     def to_dict(self) -> dict:
         return {
@@ -99,9 +429,30 @@ class Inventario:
 
     @staticmethod
     def from_dict(data: dict) -> "Inventario":
+        return Inventario.desde_productos(
+            Producto.from_dict(item) for item in data.get("productos", [])
+        )
+
+    @staticmethod
+    def desde_productos(productos: Iterable[Producto]) -> "Inventario":
+        """
+        Arma un inventario consumiendo los productos de uno en uno
+        (sirve tanto para listas como para generadores de la carga por streaming).
+        """
         inv = Inventario()
-        for item in data.get("productos", []):
-            prod = Producto.from_dict(item)
-            inv.productos[prod.get_id()] = prod
-        inv._reconstruir_index()
-        return inv
\ No newline at end of file
+        inv._carga_masiva = True
+        try:
+            with gc_pausado():
+                for prod in productos:
+                    pid = prod.get_id()
+                    if pid in inv.productos:
+                        inv._reemplazar(pid, prod)  # si el ID se repite, gana el último
+                    else:
+                        inv._insertar(pid, prod)
+
+                # Carga masiva: un solo sort de la vista ordenada al final
+                # (se arma desde _nombres_norm porque un ID repetido deja claves viejas pendientes)
+                inv._orden = ListaOrdenada((nombre, pid) for pid, nombre in inv._nombres_norm.items())
+        finally:
+            inv._carga_masiva = False
+        return inv
@@ -0,0 +1,274 @@
+"""
+Fachada asyncio sobre Inventario + servidor TCP local de líneas JSON.
+
+Protocolo (una petición y una respuesta por línea, UTF-8):
+    {"op": "obtener", "id": "P1"}
+    -> {"ok": true, "resultado": {"id": "P1", ...}}
+    -> {"ok": false, "error": "..."}
+Operaciones: agregar (producto), eliminar (id), actualizar (id, cantidad, precio),
+obtener (id), buscar (nombre, limit), listar (offset, limit), resumen.
+
+Uso (desde esta carpeta):
+    python inventario_async.py [puerto]
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+from typing import Any, Callable, List, Optional, Tuple
+
+from inventario import Inventario
+from producto import Producto
+from storage import ARCHIVO_DEFAULT, cargar_inventario, guardar_productos
+
+HOST_DEFAULT = "127.0.0.1"
+PUERTO_DEFAULT = 8765
+RETARDO_GUARDADO = 1.0  # segundos que se agrupan cambios antes de escribir el snapshot
+BACKLOG = 4096          # conexiones pendientes de aceptar (muchos clientes conectando a la vez)
+LIMITE_LISTADO = 100    # productos por respuesta de "listar"/"buscar" si el cliente no indica limit
+
+
+class AsyncInventario:
+    """
+    Inventario para muchas corrutinas a la vez:
+      - Los cambios se encolan y un único worker los aplica en orden
+        (nunca hay dos mutaciones intercaladas).
+      - Las consultas se responden directo desde el inventario en memoria:
+        corren en el hilo del event loop, así que nunca ven un cambio a medias.
+      - Guardado diferido (write-behind): tras un cambio se espera
+        `retardo_guardado` segundos, se copia el estado en el loop y el archivo
+        se escribe en un hilo del executor, sin bloquear a los clientes.
+        Los cambios de ese intervalo se pierden si el proceso muere.
+    """
+
+    def __init__(
+        self,
+        inventario: Inventario,
+        ruta: str = ARCHIVO_DEFAULT,
+        retardo_guardado: float = RETARDO_GUARDADO,
+    ) -> None:
+        self.inventario = inventario
+        self.ruta = ruta
+        self.retardo_guardado = retardo_guardado
+        self.error_guardado: Optional[BaseException] = None
+        self._cola: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._temporizador: Optional[asyncio.TimerHandle] = None
+        self._tarea_guardado: Optional[asyncio.Task] = None
+        self._lock_guardado: Optional[asyncio.Lock] = None
+        self._pendiente = False
+        self._cerrando = False
+
+    # -------- Ciclo de vida --------
+
+    async def iniciar(self) -> None:
+        self._cola = asyncio.Queue()
+        self._lock_guardado = asyncio.Lock()
+        self._worker = asyncio.create_task(self._procesar())
+
+    async def cerrar(self) -> None:
+        """Aplica los cambios encolados, detiene el worker y guarda lo pendiente."""
+        await self._cola.join()
+        self._worker.cancel()
+        # No se cancela una escritura en curso: el hilo seguiría escribiendo
+        self._cerrando = True
+        if self._temporizador is not None:
+            self._temporizador.cancel()
+            self._temporizador = None
+        if self._tarea_guardado is not None:
+            await self._tarea_guardado
+        await self.guardar()
+
+    async def __aenter__(self) -> "AsyncInventario":
+        await self.iniciar()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.cerrar()
+
+    # -------- Mutaciones (encoladas) --------
+
+    async def _encolar(self, funcion: Callable[..., Any], *args: Any) -> Any:
+        futuro = asyncio.get_running_loop().create_future()
+        await self._cola.put((funcion, args, futuro))
+        return await futuro
+
+    async def _procesar(self) -> None:
+        while True:
+            funcion, args, futuro = await self._cola.get()
+            try:
+                resultado = funcion(*args)
+            except Exception as e:
+                if not futuro.cancelled():
+                    futuro.set_exception(e)
+            else:
+                if not futuro.cancelled():
+                    futuro.set_result(resultado)
+                self._marcar_cambio()
+            finally:
+                self._cola.task_done()
+
+    async def agregar_producto(self, producto: Producto) -> None:
+        producto.validar()  # antes de encolar: el worker no recibe datos inválidos
+        await self._encolar(self.inventario.agregar_producto, producto)
+
+    async def eliminar_producto(self, producto_id: str) -> None:
+        await self._encolar(self.inventario.eliminar_producto, producto_id)
+
+    async def actualizar_producto(
+        self,
+        producto_id: str,
+        nueva_cantidad: Optional[int] = None,
+        nuevo_precio: Optional[float] = None,
+    ) -> None:
+        await self._encolar(self.inventario.actualizar_producto, producto_id, nueva_cantidad, nuevo_precio)
+
+    # -------- Consultas (directas) --------
+
+    def obtener_producto(self, producto_id: str) -> Optional[Producto]:
+        return self.inventario.obtener_producto(producto_id)
+
+    def buscar_por_nombre(self, nombre: str, limit: Optional[int] = None) -> List[Producto]:
+        return self.inventario.buscar_por_nombre(nombre, limit)
+
+    def listar_todos(self, offset: int = 0, limit: Optional[int] = None) -> List[Producto]:
+        return self.inventario.listar_todos(offset, limit)
+
+    def resumen_inventario(self) -> Tuple[int, int, float]:
+        return self.inventario.resumen_inventario()
+
+    # -------- Guardado diferido --------
+
+    def _marcar_cambio(self) -> None:
+        self._pendiente = True
+        escribiendo = self._tarea_guardado is not None and not self._tarea_guardado.done()
+        if self._temporizador is None and not escribiendo:
+            self._programar_guardado()
+
+    def _programar_guardado(self) -> None:
+        if not self._cerrando:
+            self._temporizador = asyncio.get_running_loop().call_later(self.retardo_guardado, self._disparar_guardado)
+
+    def _disparar_guardado(self) -> None:
+        self._temporizador = None
+        self._tarea_guardado = asyncio.create_task(self._guardar_diferido())
+
+    async def _guardar_diferido(self) -> None:
+        try:
+            await self.guardar()
+        except Exception as e:
+            # OSError del disco o ValueError del formato (p. ej. NUL en un ID en .invb):
+            # nadie espera esta tarea, así que se guarda el error y se reintenta
+            # con el próximo cambio
+            self.error_guardado = e
+            return
+        if self._pendiente:
+            # Hubo cambios mientras se escribía
+            self._programar_guardado()
+
+    async def guardar(self) -> None:
+        """Guarda ya (si hay cambios sin guardar). La escritura corre en el executor."""
+        async with self._lock_guardado:
+            if not self._pendiente:
+                return
+            self._pendiente = False
+            copia = self._copiar_productos()
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, guardar_productos, copia, self.ruta)
+            except BaseException:
+                self._pendiente = True
+                raise
+            self.error_guardado = None
+
+    def _copiar_productos(self) -> List[Producto]:
+        """
+        Copia (en el loop) para que el hilo escriba un estado fijo.
+        Sin pausar el GC: el flag es global y el executor puede estar escribiendo.
+        """
+        return [Producto(p.id, p.nombre, p.cantidad, p.precio) for p in self.inventario.productos.values()]
+
+    # -------- Servidor TCP --------
+
+    async def servir(
+        self, host: str = HOST_DEFAULT, puerto: int = PUERTO_DEFAULT, backlog: int = BACKLOG
+    ) -> asyncio.Server:
+        return await asyncio.start_server(self.atender_cliente, host, puerto, backlog=backlog)
+
+    async def atender_cliente(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                linea = await reader.readline()
+                if not linea:
+                    break
+                respuesta = await self.responder(linea)
+                writer.write(json.dumps(respuesta, ensure_ascii=False).encode("utf-8") + b"\n")
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            # ValueError: línea más larga que el límite del StreamReader
+            pass
+        finally:
+            writer.close()
+
+    async def responder(self, linea: bytes) -> dict:
+        try:
+            peticion = json.loads(linea)
+            op = peticion.get("op")
+            if op == "obtener":
+                p = self.obtener_producto(str(peticion["id"]))
+                resultado = None if p is None else p.to_dict()
+            elif op == "buscar":
+                productos = self.buscar_por_nombre(
+                    str(peticion["nombre"]), _entero_no_negativo(peticion, "limit", LIMITE_LISTADO)
+                )
+                resultado = [p.to_dict() for p in productos]
+            elif op == "listar":
+                productos = self.listar_todos(
+                    _entero_no_negativo(peticion, "offset", 0),
+                    _entero_no_negativo(peticion, "limit", LIMITE_LISTADO),
+                )
+                resultado = [p.to_dict() for p in productos]
+            elif op == "resumen":
+                distintos, unidades, valor = self.resumen_inventario()
+                resultado = {"distintos": distintos, "unidades": unidades, "valor": valor}
+            elif op == "agregar":
+                resultado = await self.agregar_producto(Producto.from_dict(peticion["producto"]))
+            elif op == "eliminar":
+                resultado = await self.eliminar_producto(str(peticion["id"]))
+            elif op == "actualizar":
+                resultado = await self.actualizar_producto(
+                    str(peticion["id"]), peticion.get("cantidad"), peticion.get("precio")
+                )
+            else:
+                return {"ok": False, "error": f"Operación desconocida: {op!r}."}
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            return {"ok": False, "error": str(e)}
+        return {"ok": True, "resultado": resultado}
+
+
+def _entero_no_negativo(peticion: dict, campo: str, defecto: int) -> int:
+    # Un offset/limit negativo se volvería un slice desde el final
+    valor = int(peticion.get(campo, defecto))
+    if valor < 0:
+        raise ValueError(f"'{campo}' no puede ser negativo.")
+    return valor
+
+
+async def _servir_hasta_interrupcion(puerto: int) -> None:
+    inventario = cargar_inventario(ARCHIVO_DEFAULT)
+    async with AsyncInventario(inventario, ARCHIVO_DEFAULT) as inv:
+        servidor = await inv.servir(HOST_DEFAULT, puerto)
+        print(f"Sirviendo '{ARCHIVO_DEFAULT}' en {HOST_DEFAULT}:{puerto} (Ctrl+C para salir).")
+        async with servidor:
+            try:
+                await servidor.serve_forever()
+            except asyncio.CancelledError:
+                pass
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(_servir_hasta_interrupcion(int(sys.argv[1]) if len(sys.argv) > 1 else PUERTO_DEFAULT))
+    except KeyboardInterrupt:
+        pass
+    print("Inventario guardado. Saliendo…")
@@ -0,0 +1,249 @@
+from __future__ import annotations
+import math
+import operator
+from array import array
+from collections.abc import Sequence
+from itertools import compress, repeat
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from lista_ordenada import ListaOrdenada
+from producto import Producto
+from utilidades import gc_pausado
+
+
+class FilasColumnar(Sequence):
+    """
+    Resultado de una consulta de InventarioColumnar: guarda solo los números
+    de fila. Cada Producto (copia) se arma recién al accederlo, con los valores
+    de ese momento; ids() y productos() sirven para tomarlos todos de una vez.
+    Eliminar un producto mueve filas, así que después la vista queda inválida.
+    """
+
+    def __init__(self, inventario: "InventarioColumnar", filas: List[int]) -> None:
+        self._inventario = inventario
+        self._filas = filas
+        self._version = inventario._version
+
+    def _verificar(self) -> None:
+        if self._version != self._inventario._version:
+            raise RuntimeError("El inventario eliminó productos: la consulta ya no es válida.")
+
+    def __len__(self) -> int:
+        return len(self._filas)
+
+    def __getitem__(self, i: Union[int, slice]):
+        if isinstance(i, slice):
+            vista = FilasColumnar(self._inventario, self._filas[i])
+            vista._version = self._version
+            return vista
+        self._verificar()
+        return self._inventario._producto(self._filas[i])
+
+    def filas(self) -> List[int]:
+        return list(self._filas)
+
+    def ids(self) -> List[str]:
+        self._verificar()
+        return list(map(self._inventario.ids.__getitem__, self._filas))
+
+    def productos(self) -> List[Producto]:
+        self._verificar()
+        return self._inventario._productos(self._filas)
+
+
+class InventarioColumnar:
+    """
+    Inventario organizado por columnas (pensado para análisis):
+      ids, nombres, nombres_norm: list[str]
+      cantidades: array('q')  -> enteros de 64 bits contiguos
+      precios:    array('d')  -> flotantes de 64 bits contiguos
+      _filas: Dict[str, int]  -> ID -> número de fila
+    Los totales y la búsqueda por nombre recorren columnas completas con funciones
+    implementadas en C (sum, map, itertools.compress) en lugar de objetos.
+    Misma API pública que Inventario; los Producto que devuelve son copias.
+    Las consultas que devuelven varias filas entregan un FilasColumnar: solo
+    números de fila, sin armar un Producto por coincidencia hasta que se pide.
+    stock_bajo y rango_precio usan índices (valor, fila) que se arman en el
+    primer filtro (O(N log N)) y desde ahí se mantienen en cada cambio, así que
+    cada consulta es O(log N + k) en lugar de recorrer la columna entera.
+    """
+
+    def __init__(self) -> None:
+        self.ids: List[str] = []
+        self.nombres: List[str] = []
+        self.nombres_norm: List[str] = []
+        self.cantidades = array("q")
+        self.precios = array("d")
+        self._filas: Dict[str, int] = {}
+        self._version = 0  # cambia cuando se mueven filas (invalida FilasColumnar)
+        # Índices (valor, fila) por cantidad y precio; None hasta el primer filtro
+        self._por_cantidad: Optional[ListaOrdenada] = None
+        self._por_precio: Optional[ListaOrdenada] = None
+
+    @staticmethod
+    def _norm(texto: str) -> str:
+        return texto.strip().lower()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _fila(self, producto_id: str) -> int:
+        pid = producto_id.strip()
+        if pid not in self._filas:
+            raise KeyError(f"No existe producto con ID '{pid}'.")
+        return self._filas[pid]
+
+    def _indices(self):
+        """Pares (columna, índice) de los índices ya armados."""
+        return [(columna, indice) for columna, indice in
+                ((self.cantidades, self._por_cantidad), (self.precios, self._por_precio))
+                if indice is not None]
+
+    def _producto(self, fila: int) -> Producto:
+        return Producto(self.ids[fila], self.nombres[fila], self.cantidades[fila], self.precios[fila])
+
+    def _productos(self, filas: Iterable[int]) -> List[Producto]:
+        filas = list(filas)
+        with gc_pausado():
+            return list(map(
+                Producto,
+                map(self.ids.__getitem__, filas),
+                map(self.nombres.__getitem__, filas),
+                map(self.cantidades.__getitem__, filas),
+                map(self.precios.__getitem__, filas),
+            ))
+
+    # -------- Operaciones --------
+
+    def agregar_producto(self, producto: Producto) -> None:
+        """
+        Valida y convierte todos los campos antes de tocar las columnas:
+        si algo falla, ninguna columna cambia (todas siguen del mismo largo).
+        """
+        producto.validar()
+        pid = producto.get_id().strip()
+        if pid in self._filas:
+            raise ValueError(f"Ya existe un producto con ID '{pid}'.")
+        # Conversión al tipo de la columna (p. ej. cantidad 1.5 -> TypeError)
+        cantidad = array("q", [producto.get_cantidad()])
+        precio = array("d", [producto.get_precio()])
+        nombre = producto.get_nombre()
+
+        fila = len(self.ids)
+        if self._por_cantidad is not None:
+            self._por_cantidad.agregar((cantidad[0], fila))
+        if self._por_precio is not None:
+            self._por_precio.agregar((precio[0], fila))
+        self._filas[pid] = fila
+        self.ids.append(pid)
+        self.nombres.append(nombre)
+        self.nombres_norm.append(self._norm(nombre))
+        self.cantidades.extend(cantidad)
+        self.precios.extend(precio)
+
+    def eliminar_producto(self, producto_id: str) -> None:
+        """
+        Eliminación por intercambio: la última fila pasa al hueco y se
+        acortan las columnas. O(1), pero no conserva el orden de inserción.
+        """
+        fila = self._fila(producto_id)
+        ultima = len(self.ids) - 1
+        del self._filas[self.ids[fila]]
+        self._version += 1
+        for columna, indice in self._indices():
+            indice.quitar((columna[fila], fila))
+            if fila != ultima:
+                indice.quitar((columna[ultima], ultima))
+                indice.agregar((columna[ultima], fila))
+
+        if fila != ultima:
+            for columna in (self.ids, self.nombres, self.nombres_norm, self.cantidades, self.precios):
+                columna[fila] = columna[ultima]
+            self._filas[self.ids[fila]] = fila
+
+        for columna in (self.ids, self.nombres, self.nombres_norm, self.cantidades, self.precios):
+            columna.pop()
+
+    def actualizar_producto(
+        self,
+        producto_id: str,
+        nueva_cantidad: Optional[int] = None,
+        nuevo_precio: Optional[float] = None,
+    ) -> None:
+        fila = self._fila(producto_id)
+        if nueva_cantidad is not None:
+            if nueva_cantidad < 0:
+                raise ValueError("La cantidad no puede ser negativa.")
+            self._cambiar_valor(self.cantidades, self._por_cantidad, fila, int(nueva_cantidad))
+        if nuevo_precio is not None:
+            if nuevo_precio < 0:
+                raise ValueError("El precio no puede ser negativo.")
+            self._cambiar_valor(self.precios, self._por_precio, fila, float(nuevo_precio))
+
+    @staticmethod
+    def _cambiar_valor(columna: array, indice: Optional[ListaOrdenada], fila: int, valor) -> None:
+        anterior = columna[fila]
+        columna[fila] = valor  # si no entra en la columna falla acá, antes de tocar el índice
+        if indice is not None:
+            indice.quitar((anterior, fila))
+            indice.agregar((valor, fila))
+
+    def obtener_producto(self, producto_id: str) -> Optional[Producto]:
+        fila = self._filas.get(producto_id.strip())
+        return None if fila is None else self._producto(fila)
+
+    # -------- Consultas --------
+
+    def buscar_por_nombre(self, nombre: str) -> FilasColumnar:
+        consulta = self._norm(nombre)
+        if not consulta:
+            return FilasColumnar(self, [])
+        mascara = map(operator.contains, self.nombres_norm, repeat(consulta))
+        filas = list(compress(range(len(self.ids)), mascara))
+        filas.sort(key=self.nombres_norm.__getitem__)
+        return FilasColumnar(self, filas)
+
+    def listar_todos(self) -> FilasColumnar:
+        filas = sorted(range(len(self.ids)), key=lambda f: (self.nombres_norm[f], self.ids[f]))
+        return FilasColumnar(self, filas)
+
+    def stock_bajo(self, umbral: float) -> FilasColumnar:
+        """Productos con cantidad < umbral, de menor a mayor cantidad."""
+        if self._por_cantidad is None:
+            self._por_cantidad = ListaOrdenada(zip(self.cantidades, range(len(self.ids))))
+        # Cantidades enteras: cantidad < umbral equivale a cantidad <= ceil(umbral) - 1
+        pares = self._por_cantidad.rango(None, math.ceil(umbral) - 1, key=itemgetter(0))
+        return FilasColumnar(self, list(map(itemgetter(1), pares)))
+
+    def rango_precio(self, minimo: float, maximo: float) -> FilasColumnar:
+        """Productos con minimo <= precio <= maximo, de menor a mayor precio."""
+        if self._por_precio is None:
+            self._por_precio = ListaOrdenada(zip(self.precios, range(len(self.ids))))
+        pares = self._por_precio.rango(minimo, maximo, key=itemgetter(0))
+        return FilasColumnar(self, list(map(itemgetter(1), pares)))
+
+    def resumen_inventario(self) -> Tuple[int, int, float]:
+        """
+        (cantidad_de_productos_distintos, unidades_totales, valor_total)
+        calculado columna por columna.
+        """
+        unidades = sum(self.cantidades)
+        valor = math.fsum(map(operator.mul, self.cantidades, self.precios))
+        return (len(self.ids), unidades, round(valor, 2))
+
+    # -------- Conversión --------
+
+    def to_dict(self) -> dict:
+        return {
+            "productos": [self._producto(fila).to_dict() for fila in range(len(self.ids))]
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> "InventarioColumnar":
+        inv = InventarioColumnar()
+        for item in data.get("productos", []):
+            prod = Producto.from_dict(item)
+            if prod.get_id().strip() in inv._filas:
+                inv.eliminar_producto(prod.get_id())  # si el ID se repite, gana el último
+            inv.agregar_producto(prod)
+        return inv
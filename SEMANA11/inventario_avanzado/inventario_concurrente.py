@@ -0,0 +1,175 @@
+from __future__ import annotations
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+from inventario import Inventario
+from producto import Producto
+
+
+class LockLectoresEscritores:
+    """
+    Lock de lectores/escritores con preferencia para escritores:
+      - compartido(): muchos hilos a la vez
+      - exclusivo():  un solo hilo y ningún compartido
+    No es reentrante.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._compartidos = 0
+        self._exclusivo = False
+        self._exclusivos_esperando = 0
+
+    @contextmanager
+    def compartido(self) -> Iterator[None]:
+        with self._cond:
+            while self._exclusivo or self._exclusivos_esperando:
+                self._cond.wait()
+            self._compartidos += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._compartidos -= 1
+                if self._compartidos == 0:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def exclusivo(self) -> Iterator[None]:
+        with self._cond:
+            self._exclusivos_esperando += 1
+            while self._exclusivo or self._compartidos:
+                self._cond.wait()
+            self._exclusivos_esperando -= 1
+            self._exclusivo = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._exclusivo = False
+                self._cond.notify_all()
+
+
+class InventarioConcurrente:
+    """
+    Envoltorio seguro para hilos sobre Inventario.
+    Estrategia de bloqueo:
+      - Altas, bajas y lotes cambian la estructura (dict, índices de nombre):
+        toman el lock de lectores/escritores en modo exclusivo.
+      - Consultas (listar, buscar, rangos, resumen) lo toman en modo compartido,
+        así que corren en paralelo entre sí.
+      - Cambios de cantidad/precio de UN producto también van en modo compartido,
+        más el lock de la franja de su ID (operaciones compuestas atómicas por ID)
+        y un mutex corto para los datos agregados (totales, índices por rango, journal).
+    Los Producto devueltos son los objetos vivos: para modificarlos use los
+    métodos de esta clase, no sus setters.
+    """
+
+    def __init__(self, inventario: Optional[Inventario] = None, franjas: int = 64) -> None:
+        self._inv = inventario if inventario is not None else Inventario()
+        self._rw = LockLectoresEscritores()
+        self._franjas = [threading.Lock() for _ in range(franjas)]
+        self._mutex_datos = threading.Lock()
+
+    def _franja(self, producto_id: str) -> threading.Lock:
+        return self._franjas[hash(producto_id) % len(self._franjas)]
+
+    def _producto(self, producto_id: str) -> Producto:
+        pid = producto_id.strip()
+        producto = self._inv.productos.get(pid)
+        if producto is None:
+            raise KeyError(f"No existe producto con ID '{pid}'.")
+        return producto
+
+    # -------- Cambios estructurales (exclusivo) --------
+
+    def agregar_producto(self, producto: Producto) -> None:
+        with self._rw.exclusivo():
+            self._inv.agregar_producto(producto)
+
+    def eliminar_producto(self, producto_id: str) -> None:
+        with self._rw.exclusivo():
+            self._inv.eliminar_producto(producto_id)
+
+    def agregar_lote(self, items) -> List[Tuple[int, str]]:
+        with self._rw.exclusivo():
+            # Sin pausar el GC: el flag es global y otros hilos siguen leyendo
+            return self._inv.agregar_lote(items, pausar_gc=False)
+
+    def actualizar_lote(self, items) -> List[Tuple[int, str]]:
+        with self._rw.exclusivo():
+            return self._inv.actualizar_lote(items)
+
+    # -------- Cambios por ID (compartido + franja) --------
+
+    def actualizar_producto(
+        self,
+        producto_id: str,
+        nueva_cantidad: Optional[int] = None,
+        nuevo_precio: Optional[float] = None,
+    ) -> None:
+        with self._rw.compartido(), self._franja(producto_id.strip()):
+            with self._mutex_datos:
+                self._inv.actualizar_producto(producto_id, nueva_cantidad, nuevo_precio)
+
+    def reservar_stock(self, producto_id: str, unidades: int) -> bool:
+        """
+        Descuenta `unidades` solo si hay stock suficiente (verificar y descontar
+        es atómico). Retorna False si no alcanzaba; KeyError si no existe el ID.
+        """
+        if unidades <= 0:
+            raise ValueError("Las unidades a reservar deben ser positivas.")
+        with self._rw.compartido(), self._franja(producto_id.strip()):
+            producto = self._producto(producto_id)
+            if producto.get_cantidad() < unidades:
+                return False
+            with self._mutex_datos:
+                producto.set_cantidad(producto.get_cantidad() - unidades)
+            return True
+
+    def reponer_stock(self, producto_id: str, unidades: int) -> None:
+        """Suma `unidades` al stock (por ejemplo, al cancelar una reserva)."""
+        if unidades <= 0:
+            raise ValueError("Las unidades a reponer deben ser positivas.")
+        with self._rw.compartido(), self._franja(producto_id.strip()):
+            producto = self._producto(producto_id)
+            with self._mutex_datos:
+                producto.set_cantidad(producto.get_cantidad() + unidades)
+
+    # -------- Consultas (compartido) --------
+
+    def obtener_producto(self, producto_id: str) -> Optional[Producto]:
+        with self._rw.compartido():
+            return self._inv.obtener_producto(producto_id)
+
+    def buscar_por_nombre(self, nombre: str) -> List[Producto]:
+        with self._rw.compartido():
+            return self._inv.buscar_por_nombre(nombre)
+
+    def listar_todos(self, offset: int = 0, limit: Optional[int] = None) -> List[Producto]:
+        with self._rw.compartido():
+            return self._inv.listar_todos(offset, limit)
+
+    def rango_cantidad(self, minimo: Optional[int] = None, maximo: Optional[int] = None) -> List[Producto]:
+        with self._rw.compartido(), self._mutex_datos:
+            return self._inv.rango_cantidad(minimo, maximo)
+
+    def rango_precio(self, minimo: Optional[float] = None, maximo: Optional[float] = None) -> List[Producto]:
+        with self._rw.compartido(), self._mutex_datos:
+            return self._inv.rango_precio(minimo, maximo)
+
+    def stock_bajo(self, umbral: float) -> List[Producto]:
+        with self._rw.compartido(), self._mutex_datos:
+            return self._inv.stock_bajo(umbral)
+
+    def resumen_inventario(self) -> Tuple[int, int, float]:
+        with self._rw.compartido(), self._mutex_datos:
+            return self._inv.resumen_inventario()
+
+    def verificar_resumen(self) -> bool:
+        with self._rw.exclusivo():
+            return self._inv.verificar_resumen()
+
+    def to_dict(self) -> dict:
+        with self._rw.exclusivo():
+            return self._inv.to_dict()
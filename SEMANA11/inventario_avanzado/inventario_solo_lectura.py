@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import math
+import mmap
+import operator
+import struct
+import zlib
+from array import array
+from typing import Dict, Optional, Tuple
+
+import binario
+from producto import Producto
+from storage import leer_journal
+
+_U64 = struct.Struct("<Q")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+_FILAS_POR_BLOQUE = 1 << 16  # filas leídas por vez al recorrer columnas
+
+
+class InventarioSoloLectura:
+    """
+    Inventario de solo lectura respaldado por un snapshot binario (.invb, versión 2)
+    mapeado en memoria con mmap:
+      - Abrir es O(1): solo se lee el encabezado.
+      - obtener_producto hace búsqueda binaria en el índice de IDs del archivo
+        y arma un Producto (copia) únicamente para el registro pedido.
+      - resumen_inventario recorre las columnas numéricas sin crear Productos.
+    El sistema operativo solo carga las páginas que efectivamente se tocan.
+    Los cambios pendientes del journal (.journal) se re-aplican al abrir, en un
+    diccionario aparte que tiene prioridad sobre el snapshot. Lo que se anexe
+    al journal después de abrir no se ve: hay que volver a abrir la réplica.
+    """
+
+    def __init__(self, ruta: str) -> None:
+        self.ruta = ruta
+        self._archivo = open(ruta, "rb")
+        try:
+            self._datos = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # mmap no admite archivos vacíos
+            self._archivo.close()
+            raise ValueError("Archivo binario demasiado corto.")
+        try:
+            self._disp = binario.leer_encabezado(self._datos)
+            if self._disp.indice_ids < 0:
+                raise ValueError("El snapshot no tiene índice de IDs (versión 1): vuelva a guardarlo.")
+        except ValueError:
+            self.cerrar()
+            raise
+        self._resumen: Optional[Tuple[int, int, float]] = None
+        # ID -> Producto vigente según el journal (None = eliminado)
+        self._cambios: Dict[str, Optional[Producto]] = {}
+        try:
+            self._reaplicar_journal()
+        except (ValueError, KeyError):
+            self.cerrar()
+            raise
+
+    def _reaplicar_journal(self) -> None:
+        """Mismo orden y semántica que Inventario.aplicar_registro."""
+        for registro in leer_journal(self.ruta):
+            op = registro["op"]
+            if op in ("+", "~"):
+                prod = Producto.from_dict(registro["p"])
+                pid = prod.get_id().strip()
+                anterior = registro.get("id", pid)
+                if anterior != pid:
+                    self._cambios[anterior] = None
+                self._cambios[pid] = prod
+            elif op == "-":
+                self._cambios[registro["id"]] = None
+            else:
+                raise ValueError(f"Operación de journal desconocida: '{op}'.")
+
+    # -------- Acceso a registros --------
+
+    def __len__(self) -> int:
+        return self.resumen_inventario()[0] if self._cambios else self._disp.n
+
+    def _u64(self, inicio: int, fila: int) -> int:
+        return _U64.unpack_from(self._datos, inicio + 8 * fila)[0]
+
+    def _texto(self, offsets: int, tabla: int, fila: int) -> bytes:
+        desde = tabla + self._u64(offsets, fila)
+        hasta = tabla + self._u64(offsets, fila + 1) - 1  # sin el NUL final
+        return self._datos[desde:hasta]
+
+    def _fila_de(self, producto_id: str) -> int:
+        """Búsqueda binaria en el índice de IDs. Retorna -1 si no existe."""
+        d = self._disp
+        buscado = producto_id.strip().encode("utf-8")
+        bajo, alto = 0, d.n
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            fila = self._u64(d.indice_ids, medio)
+            actual = self._texto(d.offsets_ids, d.ids, fila)
+            if actual < buscado:
+                bajo = medio + 1
+            elif actual > buscado:
+                alto = medio
+            else:
+                return fila
+        return -1
+
+    def obtener_producto(self, producto_id: str) -> Optional[Producto]:
+        pid = producto_id.strip()
+        if pid in self._cambios:
+            prod = self._cambios[pid]
+            return None if prod is None else Producto.from_dict(prod.to_dict())
+        fila = self._fila_de(pid)
+        if fila < 0:
+            return None
+        return self._producto_en(fila)
+
+    def _producto_en(self, fila: int) -> Producto:
+        d = self._disp
+        return Producto(
+            id=self._texto(d.offsets_ids, d.ids, fila).decode("utf-8"),
+            nombre=self._texto(d.offsets_nombres, d.nombres, fila).decode("utf-8"),
+            cantidad=_I64.unpack_from(self._datos, d.cantidades + 8 * fila)[0],
+            precio=_F64.unpack_from(self._datos, d.precios + 8 * fila)[0],
+        )
+
+    # -------- Resúmenes --------
+
+    def resumen_inventario(self) -> Tuple[int, int, float]:
+        """
+        (cantidad_de_productos_distintos, unidades_totales, valor_total),
+        leyendo las columnas por bloques y corrigiendo después las filas que
+        cambió el journal. El archivo no cambia, así que se calcula una sola vez.
+        """
+        if self._resumen is None:
+            d = self._disp
+            distintos, unidades = d.n, 0
+            parciales = []
+            for desde in range(0, d.n, _FILAS_POR_BLOQUE):
+                filas = min(_FILAS_POR_BLOQUE, d.n - desde)
+                cantidades = self._columna("q", d.cantidades, desde, filas)
+                precios = self._columna("d", d.precios, desde, filas)
+                unidades += sum(cantidades)
+                parciales.append(math.fsum(map(operator.mul, cantidades, precios)))
+            for pid, prod in self._cambios.items():
+                fila = self._fila_de(pid)
+                if fila >= 0:
+                    base = self._producto_en(fila)
+                    distintos -= 1
+                    unidades -= base.get_cantidad()
+                    parciales.append(-base.get_cantidad() * base.get_precio())
+                if prod is not None:
+                    distintos += 1
+                    unidades += prod.get_cantidad()
+                    parciales.append(prod.get_cantidad() * prod.get_precio())
+            self._resumen = (distintos, unidades, round(math.fsum(parciales), 2))
+        return self._resumen
+
+    def _columna(self, typecode: str, inicio: int, desde: int, filas: int) -> array:
+        desde_byte = inicio + 8 * desde
+        return binario.columna_desde_bytes(typecode, self._datos[desde_byte:desde_byte + 8 * filas])
+
+    def verificar_checksum(self) -> bool:
+        """Recorre todo el archivo (O(N)) y compara el CRC32 del encabezado."""
+        with memoryview(self._datos) as vista:
+            crc = zlib.crc32(vista[binario.TAM_ENCABEZADO:self._disp.fin])
+        return crc == self._disp.crc
+
+    # -------- Ciclo de vida --------
+
+    def cerrar(self) -> None:
+        self._datos.close()
+        self._archivo.close()
+
+    def __enter__(self) -> "InventarioSoloLectura":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.cerrar()
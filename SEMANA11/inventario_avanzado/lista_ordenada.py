@@ -0,0 +1,133 @@
+"""
+Lista ordenada por bloques (raíz de N) para los índices del inventario.
+
+Una list plana mantenida con insort paga un memmove de O(N) en cada alta y
+baja. Aquí los elementos se reparten en bloques ordenados de ~TAM_BLOQUE:
+insertar o quitar mueve solo un bloque, y el bloque se ubica con bisect sobre
+el último elemento de cada uno.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+from itertools import chain, islice
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+TAM_BLOQUE = 1000  # elementos por bloque; se parte en dos al llegar al doble
+
+
+class ListaOrdenada:
+    """
+    Secuencia ordenada con altas y bajas en O(log N + TAM_BLOQUE).
+      - agregar / quitar: un bisect entre bloques y otro dentro del bloque.
+      - agregar_diferido + ordenar: para cargas masivas, un solo ordenamiento.
+      - rebanada(desde, hasta) y rango(minimo, maximo, key) para consultar.
+    """
+
+    def __init__(self, elementos: Iterable = ()) -> None:
+        self._bloques: List[list] = []
+        self._maximos: list = []  # último elemento de cada bloque
+        self._largo = 0
+        self._pendientes: list = []
+        self._reconstruir(sorted(elementos))
+
+    def _reconstruir(self, ordenados: list) -> None:
+        self._bloques = [ordenados[i:i + TAM_BLOQUE] for i in range(0, len(ordenados), TAM_BLOQUE)]
+        self._maximos = [bloque[-1] for bloque in self._bloques]
+        self._largo = len(ordenados)
+
+    def __len__(self) -> int:
+        return self._largo
+
+    def __iter__(self) -> Iterator:
+        return chain.from_iterable(self._bloques)
+
+    def agregar(self, elemento: Any) -> None:
+        if not self._bloques:
+            self._bloques.append([elemento])
+            self._maximos.append(elemento)
+            self._largo = 1
+            return
+
+        k = bisect_left(self._maximos, elemento)
+        if k == len(self._bloques):
+            k -= 1  # mayor que todos: va al final del último bloque
+        bloque = self._bloques[k]
+        insort(bloque, elemento)
+        self._maximos[k] = bloque[-1]
+        self._largo += 1
+
+        if len(bloque) >= 2 * TAM_BLOQUE:
+            mitad = bloque[TAM_BLOQUE:]
+            del bloque[TAM_BLOQUE:]
+            self._bloques.insert(k + 1, mitad)
+            self._maximos[k] = bloque[-1]
+            self._maximos.insert(k + 1, mitad[-1])
+
+    def quitar(self, clave: Any) -> None:
+        """
+        Quita el primer elemento >= clave, que debe existir. La clave puede ser
+        un prefijo de la tupla guardada (p. ej. (valor, ID) para (valor, ID, Producto)).
+        """
+        k = bisect_left(self._maximos, clave)
+        bloque = self._bloques[k]
+        del bloque[bisect_left(bloque, clave)]
+        self._largo -= 1
+        if bloque:
+            self._maximos[k] = bloque[-1]
+        else:
+            del self._bloques[k]
+            del self._maximos[k]
+
+    def agregar_diferido(self, elemento: Any) -> None:
+        """Acumula sin ordenar; la lista no lo ve hasta llamar a ordenar()."""
+        self._pendientes.append(elemento)
+
+    def ordenar(self) -> None:
+        """Incorpora lo acumulado con agregar_diferido."""
+        pendientes, self._pendientes = self._pendientes, []
+        if len(pendientes) * TAM_BLOQUE > self._largo:
+            # Muchos nuevos: Timsort une las dos corridas ordenadas en O(N)
+            pendientes.sort()
+            self._reconstruir(sorted(chain(self, pendientes)))
+        else:
+            for elemento in pendientes:
+                self.agregar(elemento)
+
+    def rebanada(self, desde: int = 0, hasta: Optional[int] = None) -> list:
+        """Equivale a lista[desde:hasta] con índices no negativos."""
+        hasta = self._largo if hasta is None else min(hasta, self._largo)
+        resultado: list = []
+        inicio = 0
+        for bloque in self._bloques:
+            if inicio >= hasta:
+                break
+            fin = inicio + len(bloque)
+            if fin > desde:
+                resultado.extend(bloque[max(desde - inicio, 0):hasta - inicio])
+            inicio = fin
+        return resultado
+
+    def rango(self, minimo: Any = None, maximo: Any = None,
+              key: Optional[Callable[[Any], Any]] = None) -> Iterator:
+        """Elementos con minimo <= key(elemento) <= maximo (None = sin límite), en orden."""
+        if not self._bloques:
+            return iter(())
+        if minimo is None:
+            k, pos = 0, 0
+        else:
+            k = bisect_left(self._maximos, minimo, key=key)
+            if k == len(self._bloques):
+                return iter(())
+            pos = bisect_left(self._bloques[k], minimo, key=key)
+
+        if maximo is None:
+            return chain(islice(self._bloques[k], pos, None), chain.from_iterable(self._bloques[k + 1:]))
+
+        partes = []
+        for bloque in islice(self._bloques, k, None):
+            fin = bisect_right(bloque, maximo, key=key)
+            partes.append(islice(bloque, pos, fin))
+            if fin < len(bloque):
+                break
+            pos = 0
+        return chain.from_iterable(partes)
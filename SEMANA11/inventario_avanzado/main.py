@@ -1,6 +1,6 @@
 from producto import Producto
 from inventario import Inventario
-from storage import cargar_inventario, guardar_inventario, ARCHIVO_DEFAULT
+from storage import Journal, cargar_inventario, guardar_inventario, ARCHIVO_DEFAULT
 
 
 def leer_int(mensaje: str, minimo: int | None = None) -> int:
@@ -53,6 +53,8 @@ def menu() -> None:
 
 def main() -> None:
     inventario: Inventario = cargar_inventario(ARCHIVO_DEFAULT)
+    # Cada cambio queda registrado en el journal al instante
+    journal = Journal(inventario, ARCHIVO_DEFAULT)
     print(f"Inventario cargado desde '{ARCHIVO_DEFAULT}'.")
 
     while True:
@@ -139,6 +141,7 @@ def main() -> None:
             elif opcion == "0":
                 # Guardado automático antes de salir (buena práctica)
                 guardar_inventario(inventario, ARCHIVO_DEFAULT)
+                journal.cerrar()
                 print("Inventario guardado. Saliendo…")
                 break
 
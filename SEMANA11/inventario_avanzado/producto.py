@@ -1,16 +1,42 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Any, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Producto:
     """
     Representa un producto del inventario.
     ID debe ser único.
+    Usa __slots__ (sin __dict__ por instancia) para ahorrar memoria
+    en inventarios con millones de productos.
     """
     id: str
     nombre: str
     cantidad: int
     precio: float
+    # Inventario al que pertenece: los setters le avisan para mantener sus índices
+    _inventario: Optional[Any] = field(default=None, init=False, repr=False, compare=False)
+
+    # Copias y pickle llevan solo los datos: una copia no pertenece a ningún
+    # inventario (y no arrastra el inventario entero al serializarse).
+    def __copy__(self) -> "Producto":
+        return Producto(self.id, self.nombre, self.cantidad, self.precio)
+
+    def __deepcopy__(self, memo: dict) -> "Producto":
+        return self.__copy__()  # los cuatro campos son inmutables
+
+    def __getstate__(self) -> tuple:
+        return (self.id, self.nombre, self.cantidad, self.precio)
+
+    def __setstate__(self, estado: tuple) -> None:
+        self.id, self.nombre, self.cantidad, self.precio = estado
+        self._inventario = None
+
+    def _asignar(self, campo: str, valor) -> None:
+        if self._inventario is not None:
+            self._inventario._cambiar_campo(self, campo, valor)
+        else:
+            setattr(self, campo, valor)
 
     # Getters / setters (explícitos para cumplir la consigna)
     def get_id(self) -> str:
@@ -19,7 +45,7 @@ class Producto:
     def set_id(self, nuevo_id: str) -> None:
         if not nuevo_id or not nuevo_id.strip():
             raise ValueError("El ID no puede estar vacío.")
-        self.id = nuevo_id.strip()
+        self._asignar("id", nuevo_id.strip())
 
     def get_nombre(self) -> str:
         return self.nombre
@@ -27,7 +53,7 @@ class Producto:
     def set_nombre(self, nuevo_nombre: str) -> None:
         if not nuevo_nombre or not nuevo_nombre.strip():
             raise ValueError("El nombre no puede estar vacío.")
-        self.nombre = nuevo_nombre.strip()
+        self._asignar("nombre", nuevo_nombre.strip())
 
     def get_cantidad(self) -> int:
         return self.cantidad
@@ -35,7 +61,7 @@ class Producto:
     def set_cantidad(self, nueva_cantidad: int) -> None:
         if nueva_cantidad < 0:
             raise ValueError("La cantidad no puede ser negativa.")
-        self.cantidad = int(nueva_cantidad)
+        self._asignar("cantidad", int(nueva_cantidad))
 
     def get_precio(self) -> float:
         return self.precio
@@ -43,7 +69,18 @@ class Producto:
     def set_precio(self, nuevo_precio: float) -> None:
         if nuevo_precio < 0:
             raise ValueError("El precio no puede ser negativo.")
-        self.precio = float(nuevo_precio)
+        self._asignar("precio", float(nuevo_precio))
+
+    def validar(self) -> None:
+        """Aplica las mismas reglas que los setters (para datos que llegan en lote)."""
+        if not self.id or not self.id.strip():
+            raise ValueError("El ID no puede estar vacío.")
+        if not self.nombre or not self.nombre.strip():
+            raise ValueError("El nombre no puede estar vacío.")
+        if self.cantidad < 0:
+            raise ValueError("La cantidad no puede ser negativa.")
+        if self.precio < 0:
+            raise ValueError("El precio no puede ser negativo.")
 
     def to_dict(self) -> dict:
         return {
@@ -1,21 +1,374 @@
+import csv
 import json
+import os
+import re
+from itertools import islice
 from pathlib import Path
+from typing import Iterable, Iterator, List, Sequence, TextIO, Tuple
+import binario
 from inventario import Inventario
+from producto import Producto
 
 ARCHIVO_DEFAULT = "inventario.json"
 
+# El journal vive junto al snapshot: inventario.json -> inventario.json.journal
+SUFIJO_JOURNAL = ".journal"
+UMBRAL_COMPACTACION = 4 * 1024 * 1024  # bytes de journal antes de reescribir el snapshot
+
+TAM_BLOQUE = 1 << 16  # caracteres leídos por vez en la carga por streaming
+_ESPACIOS = re.compile(r"\s*")
+_SEPARADORES = re.compile(r"[\s,]*")
+_CODIFICADOR = json.JSONEncoder(ensure_ascii=False)
+
+COLUMNAS_CSV = ["id", "nombre", "cantidad", "precio"]
+TAM_LOTE_CSV = 10_000  # filas por lote al importar (memoria acotada)
+
+
+def _ruta_journal(ruta: str) -> Path:
+    return Path(str(ruta) + SUFIJO_JOURNAL)
+
+
+def _es_binario(ruta: str) -> bool:
+    return Path(ruta).suffix == binario.EXTENSION
+
 
 def guardar_inventario(inventario: Inventario, ruta: str = ARCHIVO_DEFAULT) -> None:
+    """
+    Escribe el snapshot completo de forma atómica (temporal + os.replace)
+    y vacía el journal, porque el snapshot ya incluye todos sus cambios.
+    El formato depende de la extensión: .invb = binario, otra = JSON.
+    Si el inventario tiene un Journal sobre esa ruta, su contador de bytes
+    vuelve a cero junto con el archivo.
+    """
+    guardar_productos(list(inventario.productos.values()), ruta)
+    journal = inventario._journal
+    if journal is not None and journal._path == _ruta_journal(ruta):
+        journal._bytes = 0
+
+
+def guardar_productos(productos: Sequence[Producto], ruta: str = ARCHIVO_DEFAULT) -> None:
+    """
+    Igual que guardar_inventario, pero a partir de una lista de productos
+    (por ejemplo, una copia tomada antes de escribir desde otro hilo).
+    """
     path = Path(ruta)
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(inventario.to_dict(), f, ensure_ascii=False, indent=2)
+    temp = Path(str(ruta) + ".tmp")
+    try:
+        if _es_binario(ruta):
+            with temp.open("wb") as f:
+                binario.escribir_binario(productos, f)
+        else:
+            with temp.open("w", encoding="utf-8") as f:
+                _escribir_json(productos, f)
+        os.replace(temp, path)
+    finally:
+        if temp.exists():
+            temp.unlink()
+
+    journal = _ruta_journal(ruta)
+    if journal.exists():
+        journal.open("w", encoding="utf-8").close()
 
 
 def cargar_inventario(ruta: str = ARCHIVO_DEFAULT) -> Inventario:
+    """
+    Carga el snapshot (si existe) y luego re-aplica el journal (si existe).
+    """
     path = Path(ruta)
-    if not path.exists():
-        return Inventario()
+    if path.exists() and _es_binario(ruta):
+        inventario = Inventario.desde_productos(binario.leer_binario(path.read_bytes()))
+    elif path.exists():
+        with path.open("r", encoding="utf-8") as f:
+            inventario = Inventario.desde_productos(
+                Producto.from_dict(item) for item in _iterar_productos_json(f)
+            )
+    else:
+        inventario = Inventario()
+
+    _reaplicar_journal(inventario, ruta)
+    return inventario
+
+
+def convertir_inventario(origen: str, destino: str) -> None:
+    """
+    Convierte un snapshot entre JSON y binario (según las extensiones).
+    Incluye los cambios pendientes del journal de origen.
+    """
+    inventario = cargar_inventario(origen)
+    guardar_inventario(inventario, destino)
+
+
+def importar_csv(
+    inventario: Inventario, ruta: str, tam_lote: int = TAM_LOTE_CSV
+) -> List[Tuple[int, str]]:
+    """
+    Importa un CSV (id,nombre,cantidad,precio con encabezado) por lotes de
+    `tam_lote` filas usando Inventario.agregar_lote.
+    Retorna las filas rechazadas como (número de línea en el archivo, motivo).
+    Si una fila ocupa varias líneas (campo entre comillas con saltos de
+    línea) se informa la última; las líneas en blanco cuentan igual.
+    """
+    rechazados: List[Tuple[int, str]] = []
+    with open(ruta, "r", encoding="utf-8", newline="") as f:
+        # restval="": una columna faltante queda vacía y la fila se rechaza al validar
+        lector = csv.DictReader(f, restval="")
+        while True:
+            lote = []
+            lineas = []  # line_num del lector tras leer cada fila
+            for fila in islice(lector, tam_lote):
+                lote.append(fila)
+                lineas.append(lector.line_num)
+            if not lote:
+                break
+            for i, motivo in inventario.agregar_lote(lote):
+                rechazados.append((lineas[i], motivo))
+    return rechazados
+
+
+def exportar_csv(inventario: Inventario, ruta: str) -> None:
+    """Exporta fila por fila (sin armar la lista completa) y reemplaza de forma atómica."""
+    temp = Path(str(ruta) + ".tmp")
+    try:
+        with temp.open("w", encoding="utf-8", newline="") as f:
+            escritor = csv.writer(f)
+            escritor.writerow(COLUMNAS_CSV)
+            escritor.writerows(
+                (p.get_id(), p.get_nombre(), p.get_cantidad(), p.get_precio())
+                for p in inventario.productos.values()
+            )
+        os.replace(temp, ruta)
+    finally:
+        if temp.exists():
+            temp.unlink()
+
+
+def _escribir_json(productos: Iterable[Producto], f: TextIO) -> None:
+    """
+    Escribe el mismo texto que json.dump(inventario.to_dict(), indent=2),
+    pero producto por producto, sin armar la lista completa de dicts.
+    Cada valor se codifica con el codificador compacto (implementado en C);
+    la indentación se arma a mano.
+    """
+    encode = _CODIFICADOR.encode
+    primero = True
+    for producto in productos:
+        f.write('{\n  "productos": [\n' if primero else ",\n")
+        primero = False
+        campos = ",\n".join(
+            f"      {encode(clave)}: {encode(valor)}" for clave, valor in producto.to_dict().items()
+        )
+        f.write("    {\n" + campos + "\n    }")
+    f.write('{\n  "productos": []\n}' if primero else "\n  ]\n}")
+
+
+def _iterar_productos_json(f: TextIO, tam_bloque: int = TAM_BLOQUE) -> Iterator[dict]:
+    """
+    Recorre el arreglo "productos" del JSON leyendo por bloques y
+    decodificando un objeto a la vez (no materializa el documento completo).
+    Solo cuenta la clave "productos" del objeto raíz, como json.load(f)["productos"]:
+    las demás claves de la raíz se decodifican enteras y se descartan.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    fin_archivo = False
+
+    def leer_mas() -> None:
+        nonlocal buffer, pos, fin_archivo
+        buffer, pos = buffer[pos:], 0
+        bloque = f.read(tam_bloque)
+        fin_archivo = not bloque
+        buffer += bloque
+
+    def saltar(patron: re.Pattern) -> None:
+        nonlocal pos
+        while True:
+            pos = patron.match(buffer, pos).end()
+            if pos < len(buffer) or fin_archivo:
+                return
+            leer_mas()
+
+    def esperar(caracter: str) -> None:
+        nonlocal pos
+        saltar(_ESPACIOS)
+        if buffer[pos:pos + 1] != caracter:
+            raise ValueError(f"JSON inválido: se esperaba '{caracter}'.")
+        pos += 1
+
+    def decodificar_valor():
+        nonlocal pos
+        while True:
+            try:
+                valor, fin = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if fin_archivo:
+                    raise
+                leer_mas()  # valor partido entre bloques
+                continue
+            if fin == len(buffer) and not fin_archivo:
+                leer_mas()  # un número al final del bloque podría seguir en el próximo
+                continue
+            pos = fin
+            return valor
+
+    # 1) Recorrer las claves del objeto raíz hasta "productos"
+    leer_mas()
+    saltar(_ESPACIOS)
+    if pos == len(buffer):
+        return  # archivo vacío
+    esperar("{")
+    while True:
+        saltar(_SEPARADORES)
+        if pos == len(buffer):
+            raise ValueError("JSON incompleto: falta cerrar el objeto raíz.")
+        if buffer[pos] == "}":
+            return  # sin clave "productos"
+        clave = decodificar_valor()
+        if not isinstance(clave, str):
+            raise ValueError("JSON inválido: las claves deben ser textos.")
+        esperar(":")
+        saltar(_ESPACIOS)
+        if clave == "productos":
+            esperar("[")
+            break
+        decodificar_valor()  # otra clave de la raíz (p. ej. "meta"): se descarta
+
+    # 2) Decodificar elemento por elemento
+    while True:
+        pos = _SEPARADORES.match(buffer, pos).end()
+        if pos == len(buffer):
+            if fin_archivo:
+                raise ValueError("JSON incompleto: falta cerrar el arreglo 'productos'.")
+            buffer, pos = "", 0
+            leer_mas()
+            continue
+
+        if buffer[pos] == "]":
+            return
+
+        try:
+            item, fin = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if fin_archivo:
+                raise
+            # Objeto partido entre bloques: leer más y reintentar
+            buffer, pos = buffer[pos:], 0
+            leer_mas()
+            continue
+
+        yield item
+        pos = fin
+        if pos > tam_bloque:
+            buffer, pos = buffer[pos:], 0
+
+
+def leer_journal(ruta: str = ARCHIVO_DEFAULT) -> Iterator[dict]:
+    """
+    Registros pendientes del journal del snapshot `ruta`, en orden.
+    Vacío si no hay journal.
+    """
+    journal = _ruta_journal(ruta)
+    if not journal.exists():
+        return
+
+    with journal.open("r", encoding="utf-8") as f:
+        lineas = f.readlines()
+
+    for i, linea in enumerate(lineas):
+        if not linea.strip():
+            continue
+        try:
+            registro = json.loads(linea)
+        except json.JSONDecodeError:
+            # Solo la última línea puede quedar a medias (corte durante la escritura)
+            if i == len(lineas) - 1:
+                break
+            raise
+        yield registro
+
+
+def _reaplicar_journal(inventario: Inventario, ruta: str) -> None:
+    for registro in leer_journal(ruta):
+        inventario.aplicar_registro(registro)
+
+
+class Journal:
+    """
+    Registro de cambios de solo-anexar (write-ahead log) para el inventario.
+    - Cada alta/baja/cambio se agrega como una línea JSON compacta: O(1) de I/O.
+    - cargar_inventario() re-aplica el journal sobre el snapshot.
+    - Al superar `umbral_bytes` se compacta: se reescribe el snapshot de forma
+      atómica y el journal vuelve a empezar vacío.
+    """
+
+    def __init__(
+        self,
+        inventario: Inventario,
+        ruta: str = ARCHIVO_DEFAULT,
+        umbral_bytes: int = UMBRAL_COMPACTACION,
+    ) -> None:
+        self.inventario = inventario
+        self.ruta = ruta
+        self.umbral_bytes = umbral_bytes
+        self._path = _ruta_journal(ruta)
+        self._descartar_linea_cortada()
+        self._archivo = self._path.open("ab")
+        self._bytes = self._path.stat().st_size
+        inventario._journal = self
+
+    def _descartar_linea_cortada(self) -> None:
+        """
+        Un corte durante la escritura deja la última línea a medias (la carga
+        la ignora). Se recorta antes de anexar: si no, el próximo registro
+        quedaría pegado a ella y la línea entera sería JSON inválido.
+        """
+        if not self._path.exists():
+            return
+        with self._path.open("rb+") as f:
+            fin = f.seek(0, os.SEEK_END)
+            if fin == 0:
+                return
+            f.seek(fin - 1)
+            if f.read(1) == b"\n":
+                return
+            # Buscar hacia atrás el último salto de línea completo
+            pos = fin
+            while pos > 0:
+                desde = max(0, pos - TAM_BLOQUE)
+                f.seek(desde)
+                corte = f.read(pos - desde).rfind(b"\n")
+                if corte >= 0:
+                    f.truncate(desde + corte + 1)
+                    return
+                pos = desde
+            f.truncate(0)
+
+    def registrar(self, registro: dict) -> None:
+        linea = json.dumps(registro, ensure_ascii=False, separators=(",", ":")) + "\n"
+        datos = linea.encode("utf-8")  # umbral_bytes cuenta bytes, no caracteres
+        self._archivo.write(datos)
+        self._archivo.flush()
+        self._bytes += len(datos)
+        if self._bytes >= self.umbral_bytes:
+            self.compactar()
+
+    def compactar(self) -> None:
+        # guardar_inventario vacía el journal (y reinicia self._bytes); el
+        # archivo abierto en modo "a" sigue escribiendo al final, es decir,
+        # desde el inicio.
+        guardar_inventario(self.inventario, self.ruta)
+
+    def cerrar(self) -> None:
+        self._archivo.close()
+        if self.inventario._journal is self:
+            self.inventario._journal = None
+
+
+if __name__ == "__main__":
+    import sys
 
-    with path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
-        return Inventario.from_dict(data)
\ No newline at end of file
+    if len(sys.argv) != 3:
+        print("Uso: python storage.py <origen> <destino>   (ej. inventario.json inventario.invb)")
+        sys.exit(1)
+    convertir_inventario(sys.argv[1], sys.argv[2])
+    print(f"Inventario convertido: '{sys.argv[1]}' -> '{sys.argv[2]}'.")
@@ -0,0 +1,25 @@
+"""
+Utilidades compartidas por los módulos del inventario avanzado.
+"""
+import gc
+from contextlib import contextmanager
+from typing import Iterator
+
+
+@contextmanager
+def gc_pausado() -> Iterator[None]:
+    """
+    Pausa el recolector de ciclos durante el bloque.
+    Sirve para cargas y copias masivas: crear millones de objetos sin ciclos
+    dispara colecciones completas que no liberan nada.
+    Se puede anidar (el bloque interno no lo reactiva antes de tiempo), pero
+    el flag es global al proceso: NO usar desde hilos ni desde código asíncrono,
+    porque otro hilo podría reactivarlo en medio de este bloque.
+    """
+    activo = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if activo:
+            gc.enable()
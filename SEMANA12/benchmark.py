@@ -0,0 +1,284 @@
+"""
+Mediciones de rendimiento de la biblioteca digital.
+
+Uso (desde esta carpeta):
+    python benchmark.py                   # todas las mediciones, tamaño por defecto
+    python benchmark.py busquedas 500000  # una medición con N libros
+    python benchmark.py memoria 1000000   # catálogo grande (100 000 usuarios)
+    python benchmark.py arranque 1000000  # reapertura del archivo SQLite
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+try:
+    import resource  # no existe en Windows
+except ImportError:
+    resource = None
+
+from biblioteca_digital import Biblioteca, Libro, Usuario
+from biblioteca_sqlite import BibliotecaSQLite
+
+LIMITE_MEMORIA = 200_000  # más libros: reconstruir en memoria tarda minutos (ver "memoria")
+TAM_PAGINA = 50           # resultados por página del buscador
+
+PALABRAS = [
+    "amor", "guerra", "sombra", "ciudad", "noche", "mar", "tiempo", "silencio",
+    "jardín", "historia", "viaje", "memoria", "fuego", "río", "luz", "camino",
+]
+NOMBRES = ["Ana", "Luis", "Marta", "Jorge", "Lucía", "Pedro", "Sofía", "Diego"]
+APELLIDOS = ["García", "Orwell", "Pérez", "Harari", "Ruiz", "Márquez", "Borges", "Allende"]
+CATEGORIAS = ["Novela", "Distopía", "Historia", "Poesía", "Ensayo", "Ciencia", "Infantil", "Teatro"]
+CONSULTAS = [("titulo", "sombra"), ("titulo", "mar 19"), ("autor", "borges"), ("autor", "zzz"), ("categoria", "poesía")]
+
+
+def generar_libros(n: int, rnd: random.Random):
+    for i in range(n):
+        autor = f"{rnd.choice(NOMBRES)} {rnd.choice(APELLIDOS)} {i % 997}"
+        titulo = " ".join(rnd.sample(PALABRAS, 2)) + f" {rnd.randint(1900, 2025)}"
+        yield Libro((autor, titulo), rnd.choice(CATEGORIAS), f"ISBN-{i}")
+
+
+def generar_prestamos(n: int, usuarios: int, prestados: float, rnd: random.Random):
+    return [(f"U{rnd.randrange(usuarios)}", f"ISBN-{i}") for i in rnd.sample(range(n), int(n * prestados))]
+
+
+def generar_biblioteca(n: int, usuarios: int = 1000, prestados: float = 0.1, semilla: int = 42) -> Biblioteca:
+    """N libros sintéticos; una fracción queda prestada entre los usuarios."""
+    rnd = random.Random(semilla)
+    biblio = Biblioteca()
+    for libro in generar_libros(n, rnd):
+        biblio.agregar_libro(libro)
+    for u in range(usuarios):
+        biblio.registrar_usuario(Usuario(f"Usuario {u}", f"U{u}"))
+    for user_id, isbn in generar_prestamos(n, usuarios, prestados, rnd):
+        biblio.prestar_libro(user_id, isbn)
+    return biblio
+
+
+def generar_sqlite(ruta: str, n: int, usuarios: int = 1000, prestados: float = 0.1, semilla: int = 42) -> None:
+    """Los mismos datos que generar_biblioteca, cargados en bloque en un archivo SQLite."""
+    rnd = random.Random(semilla)
+    with BibliotecaSQLite(ruta) as biblio:
+        biblio.agregar_libros(generar_libros(n, rnd))
+        biblio.registrar_usuarios(Usuario(f"Usuario {u}", f"U{u}") for u in range(usuarios))
+        biblio.prestar_lote(generar_prestamos(n, usuarios, prestados, rnd))
+
+
+def medir(funcion) -> float:
+    inicio = time.perf_counter()
+    funcion()
+    return time.perf_counter() - inicio
+
+
+def pico_rss_mb():
+    """Pico de memoria residente del proceso hasta ahora (None si no se puede medir)."""
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa KB; macOS, bytes
+    return round(pico / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def copiar_como_antes(biblio: Biblioteca) -> list:
+    """Lo que hacía _todos_los_libros() en cada búsqueda: lista nueva con disponibles + prestados."""
+    libros = list(biblio.libros_disponibles())
+    for u in biblio.usuarios.values():
+        libros.extend(u.libros_prestados.values())
+    return libros
+
+
+def buscar_recorriendo(biblio: Biblioteca, campo: str, texto: str) -> list:
+    """Búsqueda como antes de los índices: copia del catálogo + recorrido completo."""
+    texto = texto.strip().lower()
+    if campo == "categoria":
+        return [l for l in copiar_como_antes(biblio) if texto == l.categoria.lower()]
+    return [l for l in copiar_como_antes(biblio) if texto in getattr(l, campo).lower()]
+
+
+def bench_busquedas(n: int) -> None:
+    """Búsquedas por título, autor y categoría: índices vs recorrido completo."""
+    print(f"\n[busquedas] {n} libros")
+    biblio = None
+
+    def construir() -> None:
+        nonlocal biblio
+        biblio = generar_biblioteca(n)
+
+    print(f"  construcción con índices {medir(construir):8.3f} s")
+
+    repeticiones = 20
+    for campo, texto in CONSULTAS:
+        buscar = getattr(biblio, f"buscar_por_{campo}")
+        indexado = buscar(texto)
+        recorrido = buscar_recorriendo(biblio, campo, texto)
+        assert sorted(l.isbn for l in indexado) == sorted(l.isbn for l in recorrido)
+
+        t_indice = medir(lambda: [buscar(texto) for _ in range(repeticiones)]) / repeticiones
+        t_recorrido = medir(lambda: buscar_recorriendo(biblio, campo, texto))
+        print(f"  {campo:9} {texto!r:10} {len(indexado):8} resultados  "
+              f"índice {t_indice * 1000:9.3f} ms  recorrido {t_recorrido * 1000:9.3f} ms")
+
+
+def bench_memoria(n: int) -> None:
+    """Memoria del catálogo maestro y latencia de búsqueda sin copiar el catálogo."""
+    usuarios = 100_000
+    print(f"\n[memoria] {n} libros, {usuarios} usuarios (10% prestados)")
+    rss_inicial = pico_rss_mb()
+    biblio = None
+
+    def construir() -> None:
+        nonlocal biblio
+        biblio = generar_biblioteca(n, usuarios=usuarios)
+
+    t = medir(construir)
+    rss = pico_rss_mb()
+    if rss is not None:
+        print(f"  construcción {t:8.3f} s  pico RSS {rss} MB (+{rss - rss_inicial:.1f} MB)")
+    else:
+        print(f"  construcción {t:8.3f} s")
+
+    # Consulta corta (sin trigramas): recorre el catálogo completo
+    for campo, texto in CONSULTAS + [("titulo", "ma")]:
+        buscar = getattr(biblio, f"buscar_por_{campo}")
+        t_indice = medir(lambda: buscar(texto))
+        print(f"  {campo:9} {texto!r:10} {t_indice * 1000:9.3f} ms")
+
+    # Antes cada búsqueda armaba una lista con todos los libros (mismo tamaño que esta)
+    copia = []
+    t_copia = medir(lambda: copia.extend(biblio.catalogo.values()))
+    print(f"  copia previa por búsqueda (antes): {t_copia * 1000:.3f} ms, "
+          f"{sys.getsizeof(copia) / 1024 / 1024:.1f} MB de lista que ya no se crea")
+
+
+def bench_devoluciones(n: int) -> None:
+    """Cuenta institucional con N préstamos: devolver todo en orden aleatorio."""
+    print(f"\n[devoluciones] un usuario con {n} libros prestados")
+    biblio = generar_biblioteca(n, usuarios=1, prestados=0)
+    for i in range(n):
+        biblio.prestar_libro("U0", f"ISBN-{i}")
+    orden = [f"ISBN-{i}" for i in random.Random(7).sample(range(n), n)]
+
+    t_quien = medir(lambda: [biblio.prestatario(isbn) for isbn in orden])
+    print(f"  prestatario(isbn)         {t_quien / n * 1e6:9.3f} µs/consulta")
+
+    # Como antes: lista de Libro, búsqueda lineal del ISBN y pop del medio
+    lista = list(biblio.usuarios["U0"].libros_prestados.values())
+    muestra = orden[:min(n, 5_000)]
+
+    def devolver_de_lista() -> None:
+        for isbn in muestra:
+            for i, libro in enumerate(lista):
+                if libro.isbn == isbn:
+                    lista.pop(i)
+                    break
+
+    t_lista = medir(devolver_de_lista)
+    t_dict = medir(lambda: [biblio.devolver_libro("U0", isbn) for isbn in orden])
+    assert biblio.listar_libros_prestados("U0") == []
+    print(f"  devolver (dict por ISBN)  {t_dict / n * 1e6:9.3f} µs/devolución")
+    print(f"  devolver (lista, antes)   {t_lista / len(muestra) * 1e6:9.3f} µs/devolución"
+          f"  (muestra de {len(muestra)})")
+
+
+def bench_lotes(n: int) -> None:
+    """Inicio/fin de semestre: N préstamos y N devoluciones, llamada por llamada vs en lote."""
+    print(f"\n[lotes] {n} préstamos y devoluciones (1% de pares inválidos)")
+    rnd = random.Random(7)
+    usuarios = max(1, n // 10)
+    pares = [(f"U{rnd.randrange(usuarios)}", f"ISBN-{i}") for i in range(n)]
+    for i in rnd.sample(range(n), n // 100):
+        pares[i] = ("U-inexistente", pares[i][1])
+
+    resultados = {}
+    for nombre in ("por llamada", "en lote"):
+        biblio = generar_biblioteca(n, usuarios=usuarios, prestados=0)
+        if nombre == "por llamada":
+            t_prestar = medir(lambda: resultados.setdefault(nombre, [biblio.prestar_libro(u, i) for u, i in pares]))
+            t_devolver = medir(lambda: [biblio.devolver_libro(u, i) for u, i in pares])
+        else:
+            t_prestar = medir(lambda: resultados.setdefault(nombre, biblio.prestar_lote(pares)))
+            t_devolver = medir(lambda: biblio.devolver_lote(pares))
+        assert not biblio.prestamos
+        print(f"  {nombre:12} prestar {n / t_prestar:12,.0f} ops/s   devolver {n / t_devolver:12,.0f} ops/s")
+    assert resultados["por llamada"] == resultados["en lote"]
+
+    biblio = generar_biblioteca(n, usuarios=usuarios, prestados=0)
+    t = medir(lambda: biblio.prestar_lote(pares, todo_o_nada=True))
+    assert not biblio.prestamos
+    print(f"  todo o nada  rechazo del lote completo en {t * 1000:.1f} ms")
+
+
+def bench_arranque(n: int) -> None:
+    """Reinicio del servicio: abrir el archivo SQLite vs reconstruir la biblioteca en memoria."""
+    usuarios = max(1, n // 10)
+    print(f"\n[arranque] {n} libros, {usuarios} usuarios (10% prestados)")
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, "biblioteca.db")
+        t_carga = medir(lambda: generar_sqlite(ruta, n, usuarios))
+        print(f"  carga inicial en SQLite      {t_carga:8.3f} s  ({os.path.getsize(ruta) / 1024 / 1024:.0f} MB)")
+
+        biblio = None
+
+        def abrir() -> None:
+            nonlocal biblio
+            biblio = BibliotecaSQLite(ruta)
+
+        t_abrir = medir(abrir)
+        t_primera = medir(lambda: biblio.buscar_por_titulo("sombra"))
+        print(f"  reapertura (arranque)        {t_abrir * 1000:8.1f} ms  primera búsqueda {t_primera * 1000:.1f} ms")
+
+        for campo, texto in CONSULTAS + [("titulo", "ma")]:
+            buscar = getattr(biblio, f"buscar_por_{campo}")
+            t = medir(lambda: buscar(texto))
+            t_pagina = medir(lambda: buscar(texto, limit=TAM_PAGINA))
+            print(f"  {campo:9} {texto!r:10} todo {t * 1000:9.3f} ms   página de {TAM_PAGINA} {t_pagina * 1000:9.3f} ms")
+
+        usuario = biblio.prestatario(biblio.conexion.execute("SELECT isbn FROM prestamos LIMIT 1").fetchone()[0])
+        t_prestados = medir(lambda: usuario.libros_prestados)
+        print(f"  préstamos de {usuario.user_id} (carga diferida) {t_prestados * 1000:.3f} ms"
+              f"  ({len(usuario.libros_prestados)} libros)")
+
+        if n <= LIMITE_MEMORIA:
+            en_memoria = None
+
+            def reconstruir() -> None:
+                nonlocal en_memoria
+                en_memoria = generar_biblioteca(n, usuarios)
+
+            print(f"  reconstruir en memoria       {medir(reconstruir):8.3f} s")
+            for campo, texto in CONSULTAS + [("titulo", "ma")]:
+                esperado = [l.isbn for l in getattr(en_memoria, f"buscar_por_{campo}")(texto)]
+                assert [l.isbn for l in getattr(biblio, f"buscar_por_{campo}")(texto)] == esperado
+            assert biblio.listar_libros_prestados(usuario.user_id) == en_memoria.listar_libros_prestados(usuario.user_id)
+        else:
+            print(f"  reconstruir en memoria       omitido (más de {LIMITE_MEMORIA} libros; ver 'memoria')")
+        biblio.cerrar()
+
+
+MEDICIONES = {
+    "busquedas": bench_busquedas,
+    "memoria": bench_memoria,
+    "devoluciones": bench_devoluciones,
+    "lotes": bench_lotes,
+    "arranque": bench_arranque,
+}
+
+
+def main() -> None:
+    nombre = sys.argv[1] if len(sys.argv) > 1 else None
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 200_000
+
+    if nombre is None:
+        for funcion in MEDICIONES.values():
+            funcion(n)
+    elif nombre in MEDICIONES:
+        MEDICIONES[nombre](n)
+    else:
+        print(f"Medición desconocida. Opciones: {', '.join(MEDICIONES)}")
+
+
+if __name__ == "__main__":
+    main()
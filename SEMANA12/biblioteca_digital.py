@@ -1,6 +1,6 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Dict, List, Set, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Set, Optional, Tuple
 
 
 # =========================
@@ -34,12 +34,30 @@ class Usuario:
     """
     Representa un usuario.
     - ID único
-    - Lista de libros actualmente prestados (LISTA).
+    - Libros actualmente prestados: DICCIONARIO {isbn: Libro} en orden de
+      préstamo (devolver cualquiera es O(1), sin recorrer ni correr elementos)
+    - Carga diferida (opcional): si se pasa `cargar_prestados`, los préstamos
+      se leen recién la primera vez que se accede a `libros_prestados`
+      (lo usa la biblioteca persistente de biblioteca_sqlite.py).
     """
-    def __init__(self, nombre: str, user_id: str) -> None:
+    def __init__(
+        self,
+        nombre: str,
+        user_id: str,
+        cargar_prestados: Optional[Callable[[], Dict[str, Libro]]] = None,
+    ) -> None:
         self.nombre: str = nombre
         self.user_id: str = user_id
-        self.libros_prestados: List[Libro] = []  # lista por requisito
+        self._cargar_prestados = cargar_prestados
+        # isbn -> Libro, en orden de préstamo (None = aún no cargado)
+        self._libros_prestados: Optional[Dict[str, Libro]] = None if cargar_prestados else {}
+
+    @property
+    def libros_prestados(self) -> Dict[str, Libro]:
+        if self._libros_prestados is None:
+            self._libros_prestados = self._cargar_prestados()
+            self._cargar_prestados = None
+        return self._libros_prestados
 
     def __str__(self) -> str:
         return f"{self.nombre} (ID: {self.user_id})"
@@ -52,36 +70,55 @@ class Usuario:
 class Biblioteca:
     """
     Gestiona:
-    - Libros disponibles: DICCIONARIO {isbn: Libro} (búsqueda rápida por clave)
+    - Catálogo maestro: DICCIONARIO {isbn: Libro} con todos los libros,
+      disponibles o prestados (una sola estructura, sin copias al buscar)
+    - Préstamos activos: DICCIONARIO {isbn: user_id}; un libro está
+      disponible si está en el catálogo y no en este diccionario
     - Usuarios: DICCIONARIO {id: Usuario} para acceder rápido al objeto
     - IDs únicos: CONJUNTO set() para asegurar unicidad
-    - Préstamos: registro simple por usuario (la lista dentro del Usuario)
+    - Préstamos por usuario: el diccionario ordenado dentro del Usuario
+    - Índices de búsqueda sobre el catálogo completo:
+        * categoría normalizada -> ISBNs (búsqueda exacta por hash)
+        * trigrama de título / de autor -> ISBNs (índice invertido para
+          coincidencias parciales)
+      Prestar o devolver no cambia el catálogo, así que los índices solo se
+      tocan al agregar o quitar libros.
     """
     def __init__(self) -> None:
-        self.libros_disponibles: Dict[str, Libro] = {}  # isbn -> Libro
-        self.usuarios: Dict[str, Usuario] = {}          # user_id -> Usuario
-        self.ids_usuarios: Set[str] = set()             # unicidad
+        self.catalogo: Dict[str, Libro] = {}    # isbn -> Libro (disponible o prestado)
+        self.prestamos: Dict[str, str] = {}     # isbn -> user_id (solo los prestados)
+        self.usuarios: Dict[str, Usuario] = {}  # user_id -> Usuario
+        self.ids_usuarios: Set[str] = set()     # unicidad
+
+        # Orden de alta de cada ISBN: los resultados salen en el orden del catálogo
+        self._orden_alta: Dict[str, int] = {}
+        self._siguiente_alta: int = 0
+        # Categoría -> ISBNs en orden de alta (dict como conjunto ordenado)
+        self._por_categoria: Dict[str, Dict[str, None]] = {}
+        self._trigramas_titulo: Dict[str, Set[str]] = {}
+        self._trigramas_autor: Dict[str, Set[str]] = {}
 
     # -------- Libros --------
 
     def agregar_libro(self, libro: Libro) -> bool:
         """
         Añade un libro al catálogo (disponible).
-        Retorna True si se agregó, False si ya existía el ISBN.
+        Retorna True si se agregó, False si ya existía el ISBN (disponible o prestado).
         """
-        if libro.isbn in self.libros_disponibles:
+        if libro.isbn in self.catalogo:
             return False
-        self.libros_disponibles[libro.isbn] = libro
+        self._indexar(libro)
         return True
 
     def quitar_libro(self, isbn: str) -> bool:
         """
-        Quita un libro del catálogo disponible.
-        No controla si está prestado porque los prestados NO están en 'libros_disponibles'.
+        Quita un libro del catálogo.
+        Solo se puede quitar si está disponible (no prestado).
         """
-        if isbn not in self.libros_disponibles:
+        libro = self.catalogo.get(isbn)
+        if libro is None or isbn in self.prestamos:
             return False
-        del self.libros_disponibles[isbn]
+        self._desindexar(libro)
         return True
 
     # -------- Usuarios --------
@@ -120,40 +157,119 @@ class Biblioteca:
         Presta un libro:
         - Verifica usuario existente
         - Verifica libro disponible
-        - Lo mueve: disponibles -> lista prestados del usuario
+        - Lo registra en préstamos y en los préstamos del usuario
         """
         usuario = self.usuarios.get(user_id)
         if usuario is None:
             return False
 
-        libro = self.libros_disponibles.get(isbn)
-        if libro is None:
+        libro = self.catalogo.get(isbn)
+        if libro is None or isbn in self.prestamos:
             return False
 
-        # Quitar de disponibles y agregar a la lista del usuario
-        del self.libros_disponibles[isbn]
-        usuario.libros_prestados.append(libro)
+        # Sigue en el catálogo: los índices de búsqueda no cambian
+        self.prestamos[isbn] = user_id
+        usuario.libros_prestados[isbn] = libro
         return True
 
     def devolver_libro(self, user_id: str, isbn: str) -> bool:
         """
         Devuelve un libro:
-        - Verifica usuario
-        - Busca el libro en su lista prestada
-        - Lo mueve de vuelta a disponibles
+        - Verifica que el usuario lo tenga prestado (diccionario de préstamos)
+        - Lo quita de sus préstamos y del registro de préstamos (ambos O(1))
         """
         usuario = self.usuarios.get(user_id)
-        if usuario is None:
-            return False
+        if usuario is None or self.prestamos.get(isbn) != user_id:
+            return False  # no lo tenía prestado
 
-        for i, libro in enumerate(usuario.libros_prestados):
-            if libro.isbn == isbn:
-                # Quitar de prestados y volver a disponibles
-                usuario.libros_prestados.pop(i)
-                self.libros_disponibles[isbn] = libro
-                return True
+        del usuario.libros_prestados[isbn]
+        del self.prestamos[isbn]
+        return True
 
-        return False  # no lo tenía prestado
+    def prestar_lote(self, pares: Iterable[Tuple[str, str]], todo_o_nada: bool = False) -> List[bool]:
+        """
+        Presta muchos libros de una vez: pares (user_id, isbn).
+        Mismas reglas que prestar_libro, aplicadas en orden (un ISBN repetido en
+        el lote solo se presta la primera vez). Retorna un bool por par:
+        - todo_o_nada=False: se aplican los válidos; True = prestado.
+        - todo_o_nada=True: primero se valida todo el lote sin modificar nada;
+          si hay algún False no se aplica NINGUNO (los True indican qué pares
+          eran válidos).
+        """
+        if todo_o_nada:
+            pares = list(pares)
+            resultados = self._validar_prestamos(pares)
+            if not all(resultados):
+                return resultados
+
+        usuarios = self.usuarios
+        catalogo = self.catalogo
+        prestamos = self.prestamos
+        resultados = []
+        for user_id, isbn in pares:
+            usuario = usuarios.get(user_id)
+            libro = catalogo.get(isbn)
+            if usuario is None or libro is None or isbn in prestamos:
+                resultados.append(False)
+                continue
+            prestamos[isbn] = user_id
+            usuario.libros_prestados[isbn] = libro
+            resultados.append(True)
+        return resultados
+
+    def devolver_lote(self, pares: Iterable[Tuple[str, str]], todo_o_nada: bool = False) -> List[bool]:
+        """
+        Devuelve muchos libros de una vez: pares (user_id, isbn).
+        Mismo esquema que prestar_lote, con las reglas de devolver_libro.
+        """
+        if todo_o_nada:
+            pares = list(pares)
+            resultados = self._validar_devoluciones(pares)
+            if not all(resultados):
+                return resultados
+
+        usuarios = self.usuarios
+        prestamos = self.prestamos
+        resultados = []
+        for user_id, isbn in pares:
+            if prestamos.get(isbn) != user_id:
+                resultados.append(False)
+                continue
+            del usuarios[user_id].libros_prestados[isbn]
+            del prestamos[isbn]
+            resultados.append(True)
+        return resultados
+
+    def _validar_prestamos(self, pares: List[Tuple[str, str]]) -> List[bool]:
+        """Resultado que tendría cada par de prestar_lote, sin modificar nada."""
+        tomados: Set[str] = set()  # ISBNs que el lote ya habría prestado
+        resultados = []
+        for user_id, isbn in pares:
+            valido = (user_id in self.usuarios and isbn in self.catalogo
+                      and isbn not in self.prestamos and isbn not in tomados)
+            if valido:
+                tomados.add(isbn)
+            resultados.append(valido)
+        return resultados
+
+    def _validar_devoluciones(self, pares: List[Tuple[str, str]]) -> List[bool]:
+        """Resultado que tendría cada par de devolver_lote, sin modificar nada."""
+        devueltos: Set[str] = set()  # ISBNs que el lote ya habría devuelto
+        resultados = []
+        for user_id, isbn in pares:
+            valido = self.prestamos.get(isbn) == user_id and isbn not in devueltos
+            if valido:
+                devueltos.add(isbn)
+            resultados.append(valido)
+        return resultados
+
+    def prestatario(self, isbn: str) -> Optional[Usuario]:
+        """Usuario que tiene prestado el libro (None si está disponible o no existe)."""
+        user_id = self.prestamos.get(isbn)
+        return None if user_id is None else self.usuarios[user_id]
+
+    def esta_disponible(self, isbn: str) -> bool:
+        return isbn in self.catalogo and isbn not in self.prestamos
 
     # -------- Búsquedas --------
 
@@ -161,66 +277,115 @@ class Biblioteca:
         """
         Busca por título (coincidencia parcial, no sensible a mayúsculas).
         Busca en disponibles y también en prestados (para un catálogo total).
+        Usa el índice de trigramas: solo se revisan los libros candidatos.
         """
         titulo = titulo.strip().lower()
-        resultados: List[Libro] = []
-
-        for libro in self._todos_los_libros():
-            if titulo in libro.titulo.lower():
-                resultados.append(libro)
-
-        return resultados
+        candidatos = self._candidatos(self._trigramas_titulo, titulo)
+        return [libro for libro in candidatos if titulo in libro.titulo.lower()]
 
     def buscar_por_autor(self, autor: str) -> List[Libro]:
         autor = autor.strip().lower()
-        resultados: List[Libro] = []
-
-        for libro in self._todos_los_libros():
-            if autor in libro.autor.lower():
-                resultados.append(libro)
-
-        return resultados
+        candidatos = self._candidatos(self._trigramas_autor, autor)
+        return [libro for libro in candidatos if autor in libro.autor.lower()]
 
     def buscar_por_categoria(self, categoria: str) -> List[Libro]:
         categoria = categoria.strip().lower()
-        resultados: List[Libro] = []
-
-        for libro in self._todos_los_libros():
-            if categoria == libro.categoria.lower():
-                resultados.append(libro)
-
-        return resultados
+        return [self.catalogo[isbn] for isbn in self._por_categoria.get(categoria, ())]
 
     def listar_libros_prestados(self, user_id: str) -> Optional[List[Libro]]:
         """
-        Devuelve la lista de libros prestados del usuario.
+        Devuelve la lista de libros prestados del usuario, en orden de préstamo.
         Retorna None si el usuario no existe.
         """
         usuario = self.usuarios.get(user_id)
         if usuario is None:
             return None
-        return list(usuario.libros_prestados)  # copia
+        return list(usuario.libros_prestados.values())  # copia
+
+    # -------- Índices de búsqueda --------
+
+    @staticmethod
+    def _trigramas_de(texto: str) -> Set[str]:
+        return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+    @staticmethod
+    def _agregar_a(indice: Dict[str, Set[str]], claves: Iterable[str], isbn: str) -> None:
+        for clave in claves:
+            indice.setdefault(clave, set()).add(isbn)
+
+    @staticmethod
+    def _quitar_de(indice: Dict[str, Set[str]], claves: Iterable[str], isbn: str) -> None:
+        for clave in claves:
+            isbns = indice.get(clave)
+            if isbns is None:
+                continue
+            isbns.discard(isbn)
+            if not isbns:
+                del indice[clave]
+
+    def _indexar(self, libro: Libro) -> None:
+        """Agrega el libro al catálogo indexado (categoría, trigramas y orden de alta)."""
+        self.catalogo[libro.isbn] = libro
+        self._orden_alta[libro.isbn] = self._siguiente_alta
+        self._siguiente_alta += 1
+        self._por_categoria.setdefault(libro.categoria.lower(), {})[libro.isbn] = None
+        self._agregar_a(self._trigramas_titulo, self._trigramas_de(libro.titulo.lower()), libro.isbn)
+        self._agregar_a(self._trigramas_autor, self._trigramas_de(libro.autor.lower()), libro.isbn)
+
+    def _desindexar(self, libro: Libro) -> None:
+        del self.catalogo[libro.isbn]
+        del self._orden_alta[libro.isbn]
+        categoria = libro.categoria.lower()
+        isbns = self._por_categoria[categoria]
+        del isbns[libro.isbn]
+        if not isbns:
+            del self._por_categoria[categoria]
+        self._quitar_de(self._trigramas_titulo, self._trigramas_de(libro.titulo.lower()), libro.isbn)
+        self._quitar_de(self._trigramas_autor, self._trigramas_de(libro.autor.lower()), libro.isbn)
+
+    def _candidatos(self, indice: Dict[str, Set[str]], consulta: str) -> Iterable[Libro]:
+        """
+        Libros que podrían contener la consulta, en orden de alta en el catálogo.
+        Con 3+ caracteres intersectamos los trigramas (empezando por el más raro);
+        con consultas más cortas no hay trigramas y se recorre todo el catálogo.
+        """
+        if len(consulta) < 3:
+            return self._todos_los_libros()
+
+        conjuntos = []
+        for tri in self._trigramas_de(consulta):
+            isbns = indice.get(tri)
+            if not isbns:
+                return ()
+            conjuntos.append(isbns)
+
+        conjuntos.sort(key=len)
+        isbns = conjuntos[0].intersection(*conjuntos[1:])
+        return (self.catalogo[isbn] for isbn in sorted(isbns, key=self._orden_alta.__getitem__))
 
     # -------- Utilidad interna --------
 
-    def _todos_los_libros(self) -> List[Libro]:
+    def _todos_los_libros(self) -> Iterator[Libro]:
         """
-        Devuelve todos los libros: disponibles + prestados.
+        Recorre todos los libros (disponibles + prestados) sin copiarlos:
+        el catálogo maestro ya los contiene a todos.
         """
-        libros: List[Libro] = list(self.libros_disponibles.values())
-        for u in self.usuarios.values():
-            libros.extend(u.libros_prestados)
-        return libros
+        return iter(self.catalogo.values())
+
+    def libros_disponibles(self) -> Iterator[Libro]:
+        """Recorre los libros que no están prestados, en orden de alta."""
+        return (libro for isbn, libro in self.catalogo.items() if isbn not in self.prestamos)
 
     # -------- Reportes simples --------
 
     def mostrar_catalogo_disponible(self) -> None:
         print("\n=== Catálogo (Disponibles) ===")
-        if not self.libros_disponibles:
-            print("No hay libros disponibles.")
-            return
-        for libro in self.libros_disponibles.values():
+        hay_disponibles = False
+        for libro in self.libros_disponibles():
             print("-", libro)
+            hay_disponibles = True
+        if not hay_disponibles:
+            print("No hay libros disponibles.")
 
     def mostrar_usuarios(self) -> None:
         print("\n=== Usuarios registrados ===")
@@ -276,9 +441,18 @@ def main() -> None:
     for libro in prestados or []:
         print("-", libro)
 
-    print("\nDevolver l2 de U001:", biblio.devolver_libro("U001", "978-0451524935"))
+    print("\nQuién tiene l2:", biblio.prestatario("978-0451524935"))
+    print("Devolver l2 de U002 (no lo tiene):", biblio.devolver_libro("U002", "978-0451524935"))
+    print("Devolver l2 de U001:", biblio.devolver_libro("U001", "978-0451524935"))
     biblio.mostrar_catalogo_disponible()
 
+    # Préstamos en lote
+    print("\nPréstamos en lote:")
+    lote = [("U002", "978-0062316097"), ("U002", "978-0451524935"), ("U999", "978-0451524935")]
+    print("Todo o nada (hay pares inválidos):", biblio.prestar_lote(lote, todo_o_nada=True))
+    print("Lo posible:", biblio.prestar_lote(lote))
+    print("Devolver lote de U002:", biblio.devolver_lote([("U002", "978-0062316097"), ("U002", "978-0451524935")]))
+
     # Búsquedas
     print("\nBúsqueda por título 'sapiens':")
     for libro in biblio.buscar_por_titulo("sapiens"):
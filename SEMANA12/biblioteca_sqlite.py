@@ -0,0 +1,371 @@
+"""
+Biblioteca persistente sobre SQLite (módulo sqlite3 de la biblioteca estándar).
+
+Misma interfaz que Biblioteca (biblioteca_digital.py), pero los libros,
+usuarios y préstamos viven en el archivo: abrirla no recorre ni reconstruye
+nada, así que el arranque es casi instantáneo aunque haya millones de libros.
+
+- libros: id (orden de alta), isbn único, columnas normalizadas para buscar
+  e índice por categoría normalizada
+- libros_fts: índice FTS5 de trigramas sobre título y autor normalizados
+  (búsqueda parcial); si el SQLite instalado no trae FTS5 se recorre la tabla
+- usuarios: user_id -> nombre
+- prestamos: id (orden de préstamo), isbn único -> user_id, índice por usuario
+
+Las consultas usan SQL constante con parámetros: sqlite3 guarda cada
+sentencia preparada en su caché y solo la vuelve a ejecutar.
+
+Uso (desde esta carpeta):
+    python biblioteca_sqlite.py [archivo.db]
+"""
+from __future__ import annotations
+
+import sqlite3
+import sys
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from biblioteca_digital import Biblioteca, Libro, Usuario
+
+ARCHIVO_DEFAULT = "biblioteca.db"
+LARGO_MIN_TRIGRAMA = 3  # consultas más cortas no tienen trigramas: se recorre la tabla
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS libros (
+    id INTEGER PRIMARY KEY,
+    isbn TEXT NOT NULL UNIQUE,
+    autor TEXT NOT NULL,
+    titulo TEXT NOT NULL,
+    categoria TEXT NOT NULL,
+    autor_norm TEXT NOT NULL,
+    titulo_norm TEXT NOT NULL,
+    categoria_norm TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS libros_por_categoria ON libros (categoria_norm);
+CREATE TABLE IF NOT EXISTS usuarios (
+    user_id TEXT PRIMARY KEY,
+    nombre TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS prestamos (
+    id INTEGER PRIMARY KEY,
+    isbn TEXT NOT NULL UNIQUE REFERENCES libros (isbn),
+    user_id TEXT NOT NULL REFERENCES usuarios (user_id)
+);
+CREATE INDEX IF NOT EXISTS prestamos_por_usuario ON prestamos (user_id);
+"""
+
+# Índice externo (content=libros): las filas se sincronizan con triggers
+_ESQUEMA_FTS = """
+CREATE VIRTUAL TABLE IF NOT EXISTS libros_fts USING fts5 (
+    titulo_norm, autor_norm, content = 'libros', content_rowid = 'id',
+    tokenize = 'trigram case_sensitive 1'
+);
+CREATE TRIGGER IF NOT EXISTS libros_fts_alta AFTER INSERT ON libros BEGIN
+    INSERT INTO libros_fts (rowid, titulo_norm, autor_norm)
+    VALUES (new.id, new.titulo_norm, new.autor_norm);
+END;
+CREATE TRIGGER IF NOT EXISTS libros_fts_baja AFTER DELETE ON libros BEGIN
+    INSERT INTO libros_fts (libros_fts, rowid, titulo_norm, autor_norm)
+    VALUES ('delete', old.id, old.titulo_norm, old.autor_norm);
+END;
+"""
+
+_COLUMNAS_LIBRO = "l.autor, l.titulo, l.categoria, l.isbn"
+
+_SQL_AGREGAR_LIBRO = """
+INSERT OR IGNORE INTO libros (isbn, autor, titulo, categoria, autor_norm, titulo_norm, categoria_norm)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+_SQL_QUITAR_LIBRO = """
+DELETE FROM libros WHERE isbn = ? AND NOT EXISTS (SELECT 1 FROM prestamos WHERE isbn = ?)
+"""
+_SQL_REGISTRAR_USUARIO = "INSERT OR IGNORE INTO usuarios (user_id, nombre) VALUES (?, ?)"
+_SQL_BAJA_USUARIO = """
+DELETE FROM usuarios WHERE user_id = ? AND NOT EXISTS (SELECT 1 FROM prestamos WHERE user_id = ?)
+"""
+_SQL_OBTENER_USUARIO = "SELECT nombre FROM usuarios WHERE user_id = ?"
+# Una sola sentencia valida usuario y libro; el UNIQUE(isbn) descarta los ya prestados
+_SQL_PRESTAR = """
+INSERT OR IGNORE INTO prestamos (isbn, user_id)
+SELECT l.isbn, u.user_id FROM libros l, usuarios u WHERE l.isbn = ? AND u.user_id = ?
+"""
+_SQL_DEVOLVER = "DELETE FROM prestamos WHERE isbn = ? AND user_id = ?"
+_SQL_PRESTATARIO = "SELECT user_id FROM prestamos WHERE isbn = ?"
+_SQL_PRESTADOS = f"""
+SELECT {_COLUMNAS_LIBRO} FROM prestamos p JOIN libros l ON l.isbn = p.isbn
+WHERE p.user_id = ? ORDER BY p.id
+"""
+_SQL_DISPONIBLES = f"""
+SELECT {_COLUMNAS_LIBRO} FROM libros l
+WHERE NOT EXISTS (SELECT 1 FROM prestamos p WHERE p.isbn = l.isbn) ORDER BY l.id
+"""
+_SQL_ESTA_DISPONIBLE = """
+SELECT 1 FROM libros l WHERE l.isbn = ? AND NOT EXISTS (SELECT 1 FROM prestamos p WHERE p.isbn = l.isbn)
+"""
+# Búsquedas: LIMIT -1 = sin límite
+_SQL_POR_CATEGORIA = f"SELECT {_COLUMNAS_LIBRO} FROM libros l WHERE l.categoria_norm = ? ORDER BY l.id LIMIT ?"
+_SQL_FTS = f"""
+SELECT {_COLUMNAS_LIBRO} FROM libros_fts f JOIN libros l ON l.id = f.rowid
+WHERE libros_fts MATCH ? ORDER BY f.rowid LIMIT ?
+"""
+_SQL_RECORRER_TITULO = f"SELECT {_COLUMNAS_LIBRO} FROM libros l WHERE instr(l.titulo_norm, ?) > 0 ORDER BY l.id LIMIT ?"
+_SQL_RECORRER_AUTOR = f"SELECT {_COLUMNAS_LIBRO} FROM libros l WHERE instr(l.autor_norm, ?) > 0 ORDER BY l.id LIMIT ?"
+_SQL_USUARIOS = "SELECT user_id, nombre FROM usuarios ORDER BY rowid"
+
+
+def _libro(fila: Tuple[str, str, str, str]) -> Libro:
+    autor, titulo, categoria, isbn = fila
+    return Libro((autor, titulo), categoria, isbn)
+
+
+def _limite(limit: Optional[int]) -> int:
+    return -1 if limit is None else max(0, limit)
+
+
+def _fila_libro(libro: Libro) -> Tuple[str, ...]:
+    # Misma normalización que Biblioteca (str.lower de Python, que también baja tildes y ñ)
+    return (
+        libro.isbn, libro.autor, libro.titulo, libro.categoria,
+        libro.autor.lower(), libro.titulo.lower(), libro.categoria.lower(),
+    )
+
+
+class BibliotecaSQLite:
+    """
+    Biblioteca con los datos en un archivo SQLite.
+    - Cada operación es una transacción (se confirma al terminar).
+    - Los usuarios se leen a pedido; sus libros prestados se cargan recién
+      al acceder a `libros_prestados` (reflejan el estado de ese momento).
+    """
+
+    def __init__(self, ruta: str = ARCHIVO_DEFAULT) -> None:
+        self.ruta = ruta
+        self.conexion = sqlite3.connect(ruta)
+        # WAL: escrituras más baratas y lectores que no bloquean al escritor
+        self.conexion.execute("PRAGMA journal_mode = WAL")
+        self.conexion.execute("PRAGMA synchronous = NORMAL")
+        with self.conexion:
+            self.conexion.executescript(_ESQUEMA)
+            self.con_fts = self._crear_fts()
+
+    def _crear_fts(self) -> bool:
+        existe = self.conexion.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'libros_fts'"
+        ).fetchone()
+        if existe:
+            return True
+        vacia = self.conexion.execute("SELECT 1 FROM libros LIMIT 1").fetchone() is None
+        if not vacia:
+            return False  # archivo creado sin FTS5: se sigue buscando por recorrido
+        try:
+            self.conexion.executescript(_ESQUEMA_FTS)
+        except sqlite3.OperationalError:
+            return False  # SQLite compilado sin FTS5
+        return True
+
+    def cerrar(self) -> None:
+        self.conexion.close()
+
+    def __enter__(self) -> "BibliotecaSQLite":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.cerrar()
+
+    def _modificar(self, sql: str, parametros: tuple) -> bool:
+        """Ejecuta una sentencia en su propia transacción; True si cambió una fila."""
+        with self.conexion:
+            return self.conexion.execute(sql, parametros).rowcount == 1
+
+    # -------- Libros --------
+
+    def agregar_libro(self, libro: Libro) -> bool:
+        return self._modificar(_SQL_AGREGAR_LIBRO, _fila_libro(libro))
+
+    def agregar_libros(self, libros: Iterable[Libro]) -> None:
+        """Alta masiva en una sola transacción (los ISBN repetidos se ignoran)."""
+        with self.conexion:
+            self.conexion.executemany(_SQL_AGREGAR_LIBRO, map(_fila_libro, libros))
+
+    def quitar_libro(self, isbn: str) -> bool:
+        """Solo se puede quitar si está disponible (no prestado)."""
+        return self._modificar(_SQL_QUITAR_LIBRO, (isbn, isbn))
+
+    # -------- Usuarios --------
+
+    def registrar_usuario(self, usuario: Usuario) -> bool:
+        return self._modificar(_SQL_REGISTRAR_USUARIO, (usuario.user_id, usuario.nombre))
+
+    def dar_de_baja_usuario(self, user_id: str) -> bool:
+        """No se permite la baja si tiene libros prestados."""
+        return self._modificar(_SQL_BAJA_USUARIO, (user_id, user_id))
+
+    def registrar_usuarios(self, usuarios: Iterable[Usuario]) -> None:
+        """Alta masiva en una sola transacción (los IDs repetidos se ignoran)."""
+        with self.conexion:
+            self.conexion.executemany(_SQL_REGISTRAR_USUARIO, ((u.user_id, u.nombre) for u in usuarios))
+
+    def obtener_usuario(self, user_id: str) -> Optional[Usuario]:
+        fila = self.conexion.execute(_SQL_OBTENER_USUARIO, (user_id,)).fetchone()
+        if fila is None:
+            return None
+        return Usuario(fila[0], user_id, cargar_prestados=lambda: self._prestados_de(user_id))
+
+    def _prestados_de(self, user_id: str) -> Dict[str, Libro]:
+        return {fila[3]: _libro(fila) for fila in self.conexion.execute(_SQL_PRESTADOS, (user_id,))}
+
+    # -------- Préstamos --------
+
+    def prestar_libro(self, user_id: str, isbn: str) -> bool:
+        return self._modificar(_SQL_PRESTAR, (isbn, user_id))
+
+    def devolver_libro(self, user_id: str, isbn: str) -> bool:
+        return self._modificar(_SQL_DEVOLVER, (isbn, user_id))
+
+    def prestar_lote(self, pares: Iterable[Tuple[str, str]], todo_o_nada: bool = False) -> List[bool]:
+        """Igual que Biblioteca.prestar_lote, en una sola transacción."""
+        return self._aplicar_lote(_SQL_PRESTAR, pares, todo_o_nada)
+
+    def devolver_lote(self, pares: Iterable[Tuple[str, str]], todo_o_nada: bool = False) -> List[bool]:
+        """Igual que Biblioteca.devolver_lote, en una sola transacción."""
+        return self._aplicar_lote(_SQL_DEVOLVER, pares, todo_o_nada)
+
+    def _aplicar_lote(self, sql: str, pares: Iterable[Tuple[str, str]], todo_o_nada: bool) -> List[bool]:
+        """
+        Aplica los pares en orden dentro de una transacción.
+        Con todo_o_nada, si alguno falla se deshace la transacción completa:
+        el vector sigue indicando qué pares eran válidos.
+        """
+        ejecutar = self.conexion.execute
+        try:
+            resultados = [ejecutar(sql, (isbn, user_id)).rowcount == 1 for user_id, isbn in pares]
+        except BaseException:
+            self.conexion.rollback()
+            raise
+        if todo_o_nada and not all(resultados):
+            self.conexion.rollback()
+        else:
+            self.conexion.commit()
+        return resultados
+
+    def prestatario(self, isbn: str) -> Optional[Usuario]:
+        fila = self.conexion.execute(_SQL_PRESTATARIO, (isbn,)).fetchone()
+        return None if fila is None else self.obtener_usuario(fila[0])
+
+    def esta_disponible(self, isbn: str) -> bool:
+        return self.conexion.execute(_SQL_ESTA_DISPONIBLE, (isbn,)).fetchone() is not None
+
+    # -------- Búsquedas --------
+    # Mismos resultados y orden (alta en el catálogo) que Biblioteca.
+    # `limit` corta en SQLite: una página de resultados no arma todos los Libro.
+
+    def buscar_por_titulo(self, titulo: str, limit: Optional[int] = None) -> List[Libro]:
+        return self._buscar_parcial("titulo_norm", _SQL_RECORRER_TITULO, titulo, limit)
+
+    def buscar_por_autor(self, autor: str, limit: Optional[int] = None) -> List[Libro]:
+        return self._buscar_parcial("autor_norm", _SQL_RECORRER_AUTOR, autor, limit)
+
+    def buscar_por_categoria(self, categoria: str, limit: Optional[int] = None) -> List[Libro]:
+        filas = self.conexion.execute(_SQL_POR_CATEGORIA, (categoria.strip().lower(), _limite(limit)))
+        return [_libro(fila) for fila in filas]
+
+    def _buscar_parcial(self, columna: str, sql_recorrido: str, texto: str, limit: Optional[int]) -> List[Libro]:
+        texto = texto.strip().lower()
+        if self.con_fts and len(texto) >= LARGO_MIN_TRIGRAMA:
+            # Frase entre comillas: los trigramas deben aparecer seguidos = subcadena
+            frase = '"' + texto.replace('"', '""') + '"'
+            filas = self.conexion.execute(_SQL_FTS, (f"{columna} : {frase}", _limite(limit)))
+        else:
+            filas = self.conexion.execute(sql_recorrido, (texto, _limite(limit)))
+        return [_libro(fila) for fila in filas]
+
+    def listar_libros_prestados(self, user_id: str) -> Optional[List[Libro]]:
+        """En orden de préstamo. Retorna None si el usuario no existe."""
+        if self.conexion.execute(_SQL_OBTENER_USUARIO, (user_id,)).fetchone() is None:
+            return None
+        return list(self._prestados_de(user_id).values())
+
+    def libros_disponibles(self) -> Iterator[Libro]:
+        """Recorre los libros no prestados, en orden de alta (sin cargarlos todos)."""
+        return map(_libro, self.conexion.execute(_SQL_DISPONIBLES))
+
+    # -------- Importación --------
+
+    def importar(self, biblio: Biblioteca) -> None:
+        """
+        Copia una Biblioteca en memoria (libros, usuarios y préstamos) en una
+        sola transacción. Los préstamos conservan el orden de cada usuario.
+        """
+        with self.conexion:
+            self.conexion.executemany(_SQL_AGREGAR_LIBRO, map(_fila_libro, biblio.catalogo.values()))
+            self.conexion.executemany(
+                _SQL_REGISTRAR_USUARIO, ((u.user_id, u.nombre) for u in biblio.usuarios.values())
+            )
+            # Acá sí se recorren los préstamos: la copia es en memoria, no desde el archivo
+            self.conexion.executemany(
+                _SQL_PRESTAR,
+                ((isbn, u.user_id) for u in biblio.usuarios.values() for isbn in u.libros_prestados),
+            )
+
+    # -------- Reportes simples --------
+
+    def mostrar_catalogo_disponible(self) -> None:
+        print("\n=== Catálogo (Disponibles) ===")
+        hay_disponibles = False
+        for libro in self.libros_disponibles():
+            print("-", libro)
+            hay_disponibles = True
+        if not hay_disponibles:
+            print("No hay libros disponibles.")
+
+    def mostrar_usuarios(self) -> None:
+        print("\n=== Usuarios registrados ===")
+        filas = self.conexion.execute(_SQL_USUARIOS).fetchall()
+        if not filas:
+            print("No hay usuarios registrados.")
+            return
+        for user_id, nombre in filas:
+            print("-", Usuario(nombre, user_id))
+
+
+# =========================
+#         PRUEBAS
+# =========================
+
+def main(ruta: str = ARCHIVO_DEFAULT) -> None:
+    inicio = time.perf_counter()
+    biblio = BibliotecaSQLite(ruta)
+    print(f"'{ruta}' abierto en {(time.perf_counter() - inicio) * 1000:.1f} ms")
+
+    # Primera ejecución: se cargan los datos de ejemplo; después ya están en el archivo
+    if biblio.agregar_libro(Libro(("Gabriel García Márquez", "Cien años de soledad"), "Novela", "978-0307474728")):
+        biblio.agregar_libro(Libro(("George Orwell", "1984"), "Distopía", "978-0451524935"))
+        biblio.agregar_libro(Libro(("Yuval Noah Harari", "Sapiens"), "Historia", "978-0062316097"))
+        biblio.registrar_usuario(Usuario("Ana Pérez", "U001"))
+        biblio.registrar_usuario(Usuario("Carlos Ruiz", "U002"))
+        print("Datos de ejemplo guardados.")
+
+    biblio.mostrar_catalogo_disponible()
+    biblio.mostrar_usuarios()
+
+    # Alterna el préstamo en cada ejecución para ver que el estado persiste
+    prestado = biblio.prestatario("978-0451524935")
+    if prestado is None:
+        print("\nPrestar '1984' a U001:", biblio.prestar_libro("U001", "978-0451524935"))
+    else:
+        print(f"\n'1984' lo tenía {prestado}; devolver:", biblio.devolver_libro(prestado.user_id, "978-0451524935"))
+
+    usuario = biblio.obtener_usuario("U001")
+    print("Libros prestados a U001:", [libro.titulo for libro in usuario.libros_prestados.values()])
+
+    print("\nBúsqueda por título 'años':")
+    for libro in biblio.buscar_por_titulo("años"):
+        print("-", libro)
+    print("Búsqueda por autor 'or':")
+    for libro in biblio.buscar_por_autor("or"):
+        print("-", libro)
+    biblio.cerrar()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else ARCHIVO_DEFAULT)
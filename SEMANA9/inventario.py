@@ -3,9 +3,10 @@ from producto import Producto
 
 class Inventario:
     """
-    Maneja una lista de productos.
+    Maneja una colección de productos.
     Requisitos:
-    - Lista de productos
+    - Colección de productos (dict ID -> Producto: buscar por ID es O(1)
+      y el dict conserva el orden de inserción para mostrar_todos)
     - Añadir (ID único)
     - Eliminar por ID
     - Actualizar cantidad o precio por ID
@@ -14,14 +15,11 @@ class Inventario:
     """
 
     def __init__(self):
-        self.__productos = []  # Lista de objetos Producto
+        self.__productos = {}  # ID -> Producto
 
     def id_existe(self, id_producto: str) -> bool:
         """Verifica si el ID ya está registrado."""
-        for p in self.__productos:
-            if p.get_id() == id_producto:
-                return True
-        return False
+        return id_producto in self.__productos
 
     def anadir_producto(self, producto: Producto) -> bool:
         """
@@ -30,7 +28,7 @@ class Inventario:
         """
         if self.id_existe(producto.get_id()):
             return False
-        self.__productos.append(producto)
+        self.__productos[producto.get_id()] = producto
         return True
 
     def eliminar_por_id(self, id_producto: str) -> bool:
@@ -38,11 +36,7 @@ class Inventario:
         Elimina un producto por su ID.
         Retorna True si se eliminó, False si no se encontró.
         """
-        for i, p in enumerate(self.__productos):
-            if p.get_id() == id_producto:
-                self.__productos.pop(i)
-                return True
-        return False
+        return self.__productos.pop(id_producto, None) is not None
 
     def actualizar_por_id(self, id_producto: str, nueva_cantidad=None, nuevo_precio=None) -> bool:
         """
@@ -51,14 +45,14 @@ class Inventario:
         - Si nuevo_precio no es None, actualiza precio.
         Retorna True si se actualizó, False si no se encontró el ID.
         """
-        for p in self.__productos:
-            if p.get_id() == id_producto:
-                if nueva_cantidad is not None:
-                    p.set_cantidad(nueva_cantidad)
-                if nuevo_precio is not None:
-                    p.set_precio(nuevo_precio)
-                return True
-        return False
+        p = self.__productos.get(id_producto)
+        if p is None:
+            return False
+        if nueva_cantidad is not None:
+            p.set_cantidad(nueva_cantidad)
+        if nuevo_precio is not None:
+            p.set_precio(nuevo_precio)
+        return True
 
     def buscar_por_nombre(self, texto: str):
         """
@@ -67,11 +61,11 @@ class Inventario:
         """
         texto = texto.strip().lower()
         resultados = []
-        for p in self.__productos:
+        for p in self.__productos.values():
             if texto in p.get_nombre().lower():
                 resultados.append(p)
         return resultados
 
     def mostrar_todos(self):
-        """Retorna la lista completa de productos."""
-        return self.__productos
+        """Retorna la lista completa de productos (en orden de inserción)."""
+        return list(self.__productos.values())
@@ -0,0 +1,265 @@
+"""
+Compara los tres motores de inventario del repositorio con catálogos sintéticos:
+  - semana9:  SEMANA9/inventario.py (en memoria, sin archivo)
+  - semana10: SEMANA10/inventario.py (inventario.txt, guardado diferido)
+  - semana11: SEMANA11/inventario_avanzado (índices + JSON)
+
+Cada motor y tamaño corre en un proceso aparte: los tres usan los mismos
+nombres de módulo (producto, inventario) y así el pico de memoria de uno
+no contamina al otro. El resultado se escribe como JSON.
+
+Uso (desde la raíz del repositorio):
+    python benchmark_inventarios.py
+    python benchmark_inventarios.py --tamanos 1000,100000 --motores semana10,semana11 --salida resultados.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource  # no existe en Windows
+except ImportError:
+    resource = None
+
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+
+MOTORES = {
+    "semana9": os.path.join(RAIZ, "SEMANA9"),
+    "semana10": os.path.join(RAIZ, "SEMANA10"),
+    "semana11": os.path.join(RAIZ, "SEMANA11", "inventario_avanzado"),
+}
+TAMANOS = [1_000, 100_000, 1_000_000]
+SALIDA_DEFAULT = "benchmark_inventarios.json"
+
+PALABRAS = [
+    "balón", "camiseta", "zapato", "guante", "gorra", "media", "short", "casco",
+    "raqueta", "red", "botella", "mochila", "rodillera", "silbato", "cono", "pesa",
+    "adidas", "nike", "puma", "umbro", "joma", "rojo", "azul", "verde", "negro",
+    "blanco", "oficial", "réplica", "junior", "pro", "clásico", "edición",
+]
+CONSULTAS = ["adidas", "balón rojo", "pro 20", "réplica 199", "zzz"]
+MAX_CAMBIOS = 1_000  # actualizaciones y eliminaciones medidas por tamaño
+
+
+# -------------------------
+# Adaptadores (misma interfaz para los tres motores)
+# -------------------------
+class MotorSemana9:
+    descripcion = "dict en memoria, sin persistencia"
+
+    def __init__(self, carpeta_tmp: str):
+        import inventario
+        self.inventario = inventario.Inventario()
+
+    def agregar(self, p):
+        self.inventario.anadir_producto(p)
+
+    def eliminar(self, pid: str):
+        self.inventario.eliminar_por_id(pid)
+
+    def actualizar(self, pid: str, cantidad: int, precio: float):
+        self.inventario.actualizar_por_id(pid, cantidad, precio)
+
+    def buscar(self, texto: str):
+        return self.inventario.buscar_por_nombre(texto)
+
+    def listar(self):
+        return self.inventario.mostrar_todos()
+
+    def resumen(self):
+        # No tiene resumen propio: se calcula sobre el listado
+        productos = self.inventario.mostrar_todos()
+        return len(productos), sum(p.get_cantidad() for p in productos), sum(p.get_cantidad() * p.get_precio() for p in productos)
+
+    guardar = None
+    cargar = None
+
+
+class MotorSemana10(MotorSemana9):
+    descripcion = "dict + inventario.txt (guardado diferido, flush explícito)"
+
+    def __init__(self, carpeta_tmp: str):
+        import inventario
+        self._modulo = inventario
+        self.ruta = os.path.join(carpeta_tmp, "inventario.txt")
+        # Sin guardado diferido cada alta reescribiría el archivo completo
+        self.inventario = inventario.Inventario(self.ruta, max_cambios=10 ** 12)
+
+    def guardar(self):
+        self.inventario.guardar_en_archivo()
+
+    def cargar(self):
+        self.inventario = self._modulo.Inventario(self.ruta, max_cambios=10 ** 12)
+
+
+class MotorSemana11:
+    descripcion = "dict + índices (trigramas, orden, totales) + JSON"
+
+    def __init__(self, carpeta_tmp: str):
+        import inventario
+        import storage
+        self._storage = storage
+        self.ruta = os.path.join(carpeta_tmp, "inventario.json")
+        self.inventario = inventario.Inventario()
+
+    def agregar(self, p):
+        self.inventario.agregar_producto(p)
+
+    def eliminar(self, pid: str):
+        self.inventario.eliminar_producto(pid)
+
+    def actualizar(self, pid: str, cantidad: int, precio: float):
+        self.inventario.actualizar_producto(pid, cantidad, precio)
+
+    def buscar(self, texto: str):
+        return self.inventario.buscar_por_nombre(texto)
+
+    def listar(self):
+        return self.inventario.listar_todos()
+
+    def resumen(self):
+        return self.inventario.resumen_inventario()
+
+    def guardar(self):
+        self._storage.guardar_inventario(self.inventario, self.ruta)
+
+    def cargar(self):
+        self.inventario = self._storage.cargar_inventario(self.ruta)
+
+
+ADAPTADORES = {"semana9": MotorSemana9, "semana10": MotorSemana10, "semana11": MotorSemana11}
+
+
+# -------------------------
+# Medición (proceso hijo)
+# -------------------------
+def pico_rss_mb():
+    """Pico de memoria residente del proceso hasta ahora (None si no se puede medir)."""
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa KB; macOS, bytes
+    return round(pico / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def generar_catalogo(n: int, semilla: int = 42):
+    rnd = random.Random(semilla)
+    return [
+        (f"P{i}", " ".join(rnd.sample(PALABRAS, 3)) + f" {rnd.randint(1990, 2030)}",
+         rnd.randint(0, 500), round(rnd.uniform(1, 500), 2))
+        for i in range(n)
+    ]
+
+
+def medir_motor(nombre: str, n: int) -> dict:
+    sys.path.insert(0, MOTORES[nombre])
+    from producto import Producto
+
+    catalogo = generar_catalogo(n)
+    rnd = random.Random(7)
+    ids = [fila[0] for fila in catalogo]
+    cambios = min(n, MAX_CAMBIOS)
+    a_actualizar = [(rnd.choice(ids), rnd.randint(0, 500), round(rnd.uniform(1, 500), 2)) for _ in range(cambios)]
+    a_eliminar = rnd.sample(ids, cambios)
+
+    operaciones = {}
+
+    def medir(operacion: str, funcion, cantidad: int = 1) -> None:
+        inicio = time.perf_counter()
+        funcion()
+        segundos = time.perf_counter() - inicio
+        operaciones[operacion] = {
+            "segundos": round(segundos, 6),
+            "operaciones": cantidad,
+            "us_por_operacion": round(segundos / cantidad * 1e6, 3),
+        }
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        motor = ADAPTADORES[nombre](carpeta)
+        productos = [Producto(*fila) for fila in catalogo]
+        del catalogo
+
+        medir("agregar", lambda: [motor.agregar(p) for p in productos], n)
+        del productos
+        medir("actualizar", lambda: [motor.actualizar(*args) for args in a_actualizar], cambios)
+        medir("buscar", lambda: [motor.buscar(texto) for texto in CONSULTAS], len(CONSULTAS))
+        medir("listar", motor.listar)
+        medir("resumen", motor.resumen)
+        if motor.guardar is not None:
+            medir("guardar", motor.guardar)
+            medir("cargar", motor.cargar)
+        medir("eliminar", lambda: [motor.eliminar(pid) for pid in a_eliminar], cambios)
+
+    # El pico de RSS es del proceso entero, no de cada operación: se informa una
+    # sola vez por motor y tamaño (por eso cada combinación corre en su proceso)
+    return {"motor": nombre, "descripcion": motor.descripcion, "n": n,
+            "operaciones": operaciones, "pico_rss_mb": pico_rss_mb()}
+
+
+# -------------------------
+# Orquestación (proceso principal)
+# -------------------------
+def correr_en_subproceso(nombre: str, n: int) -> dict:
+    proceso = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--hijo", nombre, str(n)],
+        capture_output=True, text=True, encoding="utf-8",
+    )
+    if proceso.returncode != 0:
+        return {"motor": nombre, "n": n, "error": proceso.stderr.strip().splitlines()[-1:]}
+    return json.loads(proceso.stdout)
+
+
+def imprimir_tabla(resultado: dict) -> None:
+    if "error" in resultado:
+        print(f"  {resultado['motor']:9} n={resultado['n']:<9} ERROR {resultado['error']}")
+        return
+    celdas = "  ".join(f"{op}={datos['segundos']:.3f}s" for op, datos in resultado["operaciones"].items())
+    print(f"  {resultado['motor']:9} n={resultado['n']:<9} {celdas}  pico RSS={resultado['pico_rss_mb']} MB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de los motores de inventario.")
+    parser.add_argument("--tamanos", default=",".join(map(str, TAMANOS)),
+                        help="tamaños de catálogo separados por coma")
+    parser.add_argument("--motores", default=",".join(MOTORES),
+                        help=f"motores separados por coma ({', '.join(MOTORES)})")
+    parser.add_argument("--salida", default=SALIDA_DEFAULT, help="archivo JSON de resultados")
+    parser.add_argument("--hijo", nargs=2, metavar=("MOTOR", "N"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.hijo:
+        nombre, n = args.hijo
+        json.dump(medir_motor(nombre, int(n)), sys.stdout)
+        return
+
+    motores = [m.strip() for m in args.motores.split(",") if m.strip()]
+    desconocidos = [m for m in motores if m not in MOTORES]
+    if desconocidos:
+        parser.error(f"Motor desconocido: {', '.join(desconocidos)}")
+    tamanos = [int(t) for t in args.tamanos.split(",")]
+
+    resultados = []
+    for n in tamanos:
+        for nombre in motores:
+            resultado = correr_en_subproceso(nombre, n)
+            imprimir_tabla(resultado)
+            resultados.append(resultado)
+
+    informe = {
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "resultados": resultados,
+    }
+    with open(args.salida, "w", encoding="utf-8") as f:
+        json.dump(informe, f, ensure_ascii=False, indent=2)
+    print(f"Resultados guardados en '{args.salida}'.")
+
+
+if __name__ == "__main__":
+    main()